@@ -15,7 +15,11 @@ class User(AbstractUser):
     """
     email = models.EmailField(_('email address'), unique=True)
     is_email_verified = models.BooleanField(default=False)
-    
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['date_joined', 'id'], name='user_joined_id_idx'),
+        ]
 
     def __str__(self):
         # prefer email if available
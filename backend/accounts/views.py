@@ -4,10 +4,13 @@ from django.contrib.auth import get_user_model
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.views import TokenObtainPairView
 from datetime import timedelta
 from django.utils import timezone
 from core.throttles import LoginThrottle
+from core.pagination import PageOrCursorPagination
+from orders.cart import cart_session_id, merge_guest_cart
 from rest_framework.permissions import IsAuthenticated
 
 from .models import Profile, Address, EmailOTP, PasswordResetCode
@@ -45,8 +48,25 @@ def _get_client_ip(request):
 
 
 class ThrottledTokenObtainPairView(TokenObtainPairView):
+    """
+    POST /api/auth/login/
+    With an X-Cart-Session header the guest cart is merged into the
+    user's cart (orders.cart.merge_guest_cart).
+    """
     throttle_classes = [LoginThrottle]
 
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+
+        session_id = cart_session_id(request)
+        if session_id:
+            merge_guest_cart(serializer.user, session_id=session_id)
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
+
 
 class RegisterView(generics.CreateAPIView):
     """
@@ -430,8 +450,11 @@ class AdminUserListView(generics.ListAPIView):
     """
     GET /api/auth/users/
     -> list ALL users (admin only)
+    ?pagination=cursor -> keyset pagination on (date_joined, id)
     """
     queryset = User.objects.all().order_by("-date_joined")
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = PageOrCursorPagination
+    cursor_ordering = ("-date_joined", "-id")
 
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='featured_image_thumbnails',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
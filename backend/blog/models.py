@@ -31,6 +31,8 @@ class Post(TimeStampedModel):
         blank=True,
         null=True,
     )
+    # responsive WebP derivatives of featured_image (core.images)
+    featured_image_thumbnails = models.JSONField(default=dict, blank=True, editable=False)
 
     author = models.ForeignKey(
         User,
@@ -1,10 +1,14 @@
 # backend/blog/serializers.py
 from rest_framework import serializers
+
+from core.serializers import SrcsetField, ThumbnailField
 from .models import Post
 
 
 class PostListSerializer(serializers.ModelSerializer):
     author_name = serializers.SerializerMethodField()
+    featured_image_thumbnail = ThumbnailField(width=640, source='featured_image_thumbnails')
+    featured_image_srcset = SrcsetField(source='featured_image_thumbnails')
 
     class Meta:
         model = Post
@@ -14,6 +18,8 @@ class PostListSerializer(serializers.ModelSerializer):
             "slug",
             "summary",
             "featured_image",
+            "featured_image_thumbnail",
+            "featured_image_srcset",
             "created_at",
             "published_at",
             "author_name",
@@ -28,6 +34,8 @@ class PostListSerializer(serializers.ModelSerializer):
 
 class PostDetailSerializer(serializers.ModelSerializer):
     author_name = serializers.SerializerMethodField()
+    featured_image_thumbnail = ThumbnailField(width=640, source='featured_image_thumbnails')
+    featured_image_srcset = SrcsetField(source='featured_image_thumbnails')
 
     class Meta:
         model = Post
@@ -38,6 +46,8 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "summary",
             "content",
             "featured_image",
+            "featured_image_thumbnail",
+            "featured_image_srcset",
             "created_at",
             "published_at",
             "author_name",
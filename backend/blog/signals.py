@@ -0,0 +1,24 @@
+# backend/blog/signals.py
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.cache import bump_cache_version
+from core.images import build_thumbnails, thumbnails_are_current
+from .models import Post
+
+
+@receiver(post_save, sender=Post)
+def featured_image_saved(sender, instance, raw=False, **kwargs):
+    if raw or thumbnails_are_current(instance.featured_image, instance.featured_image_thumbnails):
+        return
+    instance.featured_image_thumbnails = build_thumbnails(instance.featured_image)
+    Post.objects.filter(pk=instance.pk).update(
+        featured_image_thumbnails=instance.featured_image_thumbnails
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, **kwargs):
+    bump_cache_version('blog')
@@ -2,6 +2,8 @@
 from rest_framework import viewsets, permissions
 from rest_framework.response import Response
 
+from core.cache import CachedReadMixin
+from core.conditional import ConditionalGetMixin
 from .models import Post
 from .serializers import PostListSerializer, PostDetailSerializer, AdminPostSerializer
 
@@ -18,7 +20,7 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         return bool(request.user and request.user.is_staff)
 
 
-class PostViewSet(viewsets.ReadOnlyModelViewSet):
+class PostViewSet(ConditionalGetMixin, CachedReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     Public API: /api/blog/posts/
     - List: Only published posts
@@ -27,6 +29,7 @@ class PostViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Post.objects.filter(is_published=True)
     serializer_class = PostListSerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespaces = ("blog",)
 
     def get_serializer_class(self):
         if self.action == "retrieve":
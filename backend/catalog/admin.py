@@ -1,6 +1,8 @@
 from django.contrib import admin
 
+from .autocomplete import autocomplete_index
 from .models import Author, Category, Tag, Book
+from .signals import reindex_on_commit
 
 
 @admin.register(Author)
@@ -11,10 +13,11 @@ class AuthorAdmin(admin.ModelAdmin):
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ("name", "slug", "parent")
+    list_display = ("name", "slug", "full_name")
     search_fields = ("name", "slug")
     list_filter = ("parent",)
     prepopulated_fields = {"slug": ("name",)}
+    readonly_fields = ("full_name", "depth")
 
 
 @admin.register(Tag)
@@ -46,6 +49,7 @@ class BookAdmin(admin.ModelAdmin):
         "slug",
         "price",
         "discount_price",
+        "effective_price",
         "currency",
         "is_published",
         "pdf_password",
@@ -55,3 +59,11 @@ class BookAdmin(admin.ModelAdmin):
     search_fields = ("title", "description", "isbn")
     prepopulated_fields = {"slug": ("title",)}
     inlines = [BookAuthorInline, BookCategoryInline, BookTagInline]
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # the inlines write the through tables directly, which sends no
+        # m2m_changed (nor save/delete signals) for the search document
+        # or the autocomplete index
+        reindex_on_commit([form.instance.pk])
+        autocomplete_index.refresh_books([form.instance.pk])
@@ -0,0 +1,240 @@
+# backend/catalog/autocomplete.py
+"""
+In-memory autocomplete index for book titles and author names.
+
+Lookups never touch the database:
+  - prefix matches come from a sorted list of (term, book_id) searched
+    with bisect
+  - typo tolerance comes from trigram postings (term similarity = shared
+    trigrams / union of trigrams)
+
+The index is loaded lazily on the first query and kept current by
+catalog.signals. Other worker processes notice changes through a shared
+version number in the Django cache and reload on their next query.
+Updates apply once the writer's transaction commits, so no process
+indexes (or reloads) rows that aren't committed yet.
+"""
+
+import random
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict, namedtuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Book
+
+
+VERSION_CACHE_KEY = 'catalog:autocomplete:version'
+MIN_SIMILARITY = 0.3
+MAX_PREFIX_HITS = 200
+
+Entry = namedtuple('Entry', ['id', 'slug', 'title', 'cover', 'name', 'terms'])
+
+
+def normalize(text):
+    return ' '.join(unicodedata.normalize('NFKC', text or '').casefold().split())
+
+
+def trigrams(term):
+    padded = f'  {term} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _terms_for(title, author_names):
+    # whole title/name plus every word, so both "harry pot" and "pot" match
+    terms = set()
+    for text in [title, *author_names]:
+        text = normalize(text)
+        if text:
+            terms.add(text)
+            terms.update(text.split())
+    return terms
+
+
+class AutocompleteIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._version = None
+        self._entries = {}
+        self._keys = []                     # sorted [(term, book_id)]
+        self._term_books = defaultdict(set)  # term -> {book_id}
+        self._trigram_terms = defaultdict(set)  # trigram -> {term}
+
+    # ---- building ----
+
+    def _reset(self):
+        self._entries = {}
+        self._keys = []
+        self._term_books = defaultdict(set)
+        self._trigram_terms = defaultdict(set)
+
+    def _load(self):
+        self._reset()
+        books = (
+            Book.objects.filter(is_published=True)
+            .only('id', 'slug', 'title', 'cover_image')
+            .prefetch_related('authors')
+        )
+        for book in books.iterator(chunk_size=2000):
+            self._add(book)
+        self._keys.sort()
+        self._loaded = True
+
+    def _entry_for(self, book):
+        cover = book.cover_image.url if book.cover_image else None
+        terms = _terms_for(book.title, [a.name for a in book.authors.all()])
+        return Entry(book.id, book.slug, book.title, cover, normalize(book.title), tuple(terms))
+
+    def _add(self, book, keep_sorted=False):
+        entry = self._entry_for(book)
+        self._entries[entry.id] = entry
+        for term in entry.terms:
+            if keep_sorted:
+                insort(self._keys, (term, entry.id))
+            else:
+                self._keys.append((term, entry.id))
+            if not self._term_books[term]:
+                for gram in trigrams(term):
+                    self._trigram_terms[gram].add(term)
+            self._term_books[term].add(entry.id)
+
+    def _remove(self, book_id):
+        entry = self._entries.pop(book_id, None)
+        if entry is None:
+            return
+        for term in entry.terms:
+            i = bisect_left(self._keys, (term, book_id))
+            if i < len(self._keys) and self._keys[i] == (term, book_id):
+                del self._keys[i]
+            books = self._term_books[term]
+            books.discard(book_id)
+            if not books:
+                del self._term_books[term]
+                for gram in trigrams(term):
+                    self._trigram_terms[gram].discard(term)
+
+    def _ensure_current(self):
+        version = cache.get(VERSION_CACHE_KEY)
+        if not self._loaded or version != self._version:
+            self._load()
+            self._version = version
+
+    def _publish_change(self):
+        # tell other processes to reload. This one is only up to date if
+        # nobody else published since it loaded; otherwise their change
+        # isn't in our copy yet and we reload on the next query too.
+        seen = self._version
+        try:
+            version = cache.incr(VERSION_CACHE_KEY)
+        except ValueError:
+            # missing/evicted: seed randomly so old numbers aren't reused
+            cache.add(VERSION_CACHE_KEY, random.randrange(1 << 32), None)
+            version = cache.incr(VERSION_CACHE_KEY)
+        if seen is not None and version == seen + 1:
+            self._version = version
+        else:
+            self._loaded = False
+
+    # ---- incremental updates (called from catalog.signals) ----
+
+    def refresh_books(self, book_ids):
+        book_ids = set(book_ids)
+        if book_ids:
+            transaction.on_commit(lambda: self._refresh_books(book_ids))
+
+    def invalidate(self):
+        # reload everywhere (this process included) on the next query
+        transaction.on_commit(self._invalidate)
+
+    def remove_books(self, book_ids):
+        book_ids = list(book_ids)
+        transaction.on_commit(lambda: self._remove_books(book_ids))
+
+    def _refresh_books(self, book_ids):
+        with self._lock:
+            if not self._loaded:
+                self._publish_change()
+                return
+            books = (
+                Book.objects.filter(pk__in=book_ids, is_published=True)
+                .only('id', 'slug', 'title', 'cover_image')
+                .prefetch_related('authors')
+            )
+            for book_id in book_ids:
+                self._remove(book_id)
+            for book in books:
+                self._add(book, keep_sorted=True)
+            self._publish_change()
+
+    def _invalidate(self):
+        with self._lock:
+            self._loaded = False
+            self._publish_change()
+
+    def _remove_books(self, book_ids):
+        with self._lock:
+            for book_id in book_ids:
+                self._remove(book_id)
+            self._publish_change()
+
+    # ---- lookups ----
+
+    def _prefix_matches(self, query):
+        i = bisect_left(self._keys, (query,))
+        end = min(len(self._keys), i + MAX_PREFIX_HITS)
+        while i < end:
+            term, book_id = self._keys[i]
+            if not term.startswith(query):
+                break
+            yield term, book_id
+            i += 1
+
+    def _fuzzy_matches(self, query):
+        grams = trigrams(query)
+        shared = Counter()
+        for gram in grams:
+            for term in self._trigram_terms.get(gram, ()):
+                shared[term] += 1
+
+        scored = []
+        for term, common in shared.items():
+            similarity = common / (len(grams) + len(trigrams(term)) - common)
+            if similarity >= MIN_SIMILARITY:
+                scored.append((similarity, term))
+        scored.sort(reverse=True)
+        for _, term in scored:
+            for book_id in sorted(self._term_books[term]):
+                yield book_id
+
+    def search(self, text, limit=8):
+        query = normalize(text)
+        if not query:
+            return []
+
+        with self._lock:
+            self._ensure_current()
+
+            # prefix hits first: titles/names that start with the query,
+            # then any word starting with it, shortest term first
+            hits = sorted(
+                self._prefix_matches(query),
+                key=lambda hit: (not self._entries[hit[1]].name.startswith(query),
+                                 len(hit[0]), hit[1]),
+            )
+            ids = list(dict.fromkeys(book_id for _, book_id in hits))
+
+            if len(ids) < limit:
+                for book_id in self._fuzzy_matches(query):
+                    if book_id not in ids:
+                        ids.append(book_id)
+                    if len(ids) >= limit:
+                        break
+
+            return [self._entries[book_id] for book_id in ids[:limit]]
+
+
+autocomplete_index = AutocompleteIndex()
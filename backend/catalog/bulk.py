@@ -0,0 +1,127 @@
+# backend/catalog/bulk.py
+"""
+Set-based admin edits for many books at once (AdminBookViewSet bulk
+actions). Each function runs in one transaction and issues a fixed number
+of statements however many books are selected.
+
+QuerySet.update() and through-table inserts skip model signals, so the
+side effects catalog.signals normally takes care of (search documents,
+autocomplete, response cache generation) are applied here explicitly,
+and updated_at is bumped so ETags and feed caches notice the change.
+
+Selections are passed as querysets and used as subqueries, so a
+storewide sale doesn't send every book id back to the database.
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, Value
+from django.db.models.functions import Round
+from django.utils import timezone
+
+from core.cache import bump_cache_version
+from .autocomplete import autocomplete_index
+from .models import Book
+from .search import update_search_index
+
+
+SEARCH_BATCH_SIZE = 1000
+
+
+def _selected_ids(queryset):
+    return list(queryset.order_by().values_list('pk', flat=True))
+
+
+def _refresh_search(book_ids):
+    for start in range(0, len(book_ids), SEARCH_BATCH_SIZE):
+        update_search_index(book_ids[start:start + SEARCH_BATCH_SIZE])
+
+
+def bulk_update_prices(queryset, price=None, discount_price=None,
+                       discount_percent=None, clear_discount=False):
+    """
+    Set a list price and/or a discount on every book in `queryset`:
+      - price:            new list price
+      - discount_price:   fixed sale price
+      - discount_percent: sale price = price * (100 - percent) / 100
+      - clear_discount:   end the sale (discount_price = NULL)
+    Returns the number of books updated.
+    """
+    changes = {'updated_at': timezone.now()}
+    if price is not None:
+        changes['price'] = Value(price)
+    if clear_discount:
+        changes['discount_price'] = None
+    elif discount_price is not None:
+        changes['discount_price'] = Value(discount_price)
+    elif discount_percent is not None:
+        base = changes.get('price', F('price'))
+        factor = (Decimal(100) - Decimal(discount_percent)) / Decimal(100)
+        changes['discount_price'] = Round(
+            ExpressionWrapper(base * Value(factor), output_field=DecimalField()),
+            precision=2,
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        )
+
+    with transaction.atomic():
+        updated = queryset.update(**changes)
+    bump_cache_version('catalog')
+    return updated
+
+
+def bulk_update_items(items):
+    """
+    Per-book prices: [{'id': 1, 'price': ..., 'discount_price': ...}, ...]
+    written with one bulk_update. Returns the number of books updated.
+    """
+    items = {item['id']: item for item in items}
+    fields = sorted({name for item in items.values() for name in item} - {'id'})
+    now = timezone.now()
+
+    with transaction.atomic():
+        books = list(Book.objects.filter(pk__in=items).only('pk', *fields))
+        for book in books:
+            for name in fields:
+                if name in items[book.pk]:
+                    setattr(book, name, items[book.pk][name])
+            book.updated_at = now
+        Book.objects.bulk_update(books, [*fields, 'updated_at'], batch_size=500)
+    bump_cache_version('catalog')
+    return len(books)
+
+
+def bulk_set_published(queryset, is_published):
+    with transaction.atomic():
+        updated = queryset.update(is_published=is_published, updated_at=timezone.now())
+    bump_cache_version('catalog')
+    # only published books are suggested
+    autocomplete_index.invalidate()
+    return updated
+
+
+def bulk_assign_tags(queryset, add=(), remove=(), replace=None):
+    """
+    Add and/or remove tags (ids) on every selected book; `replace` sets
+    the exact tag list instead. Returns the number of books touched.
+    """
+    through = Book.tags.through
+
+    with transaction.atomic():
+        book_ids = _selected_ids(queryset)
+        links = through.objects.filter(book_id__in=queryset.values('pk'))
+        if replace is not None:
+            links.delete()
+            add, remove = replace, ()
+        elif remove:
+            links.filter(tag_id__in=remove).delete()
+        if add:
+            through.objects.bulk_create(
+                [through(book_id=book_id, tag_id=tag_id) for book_id in book_ids for tag_id in add],
+                ignore_conflicts=True,
+                batch_size=1000,
+            )
+        queryset.update(updated_at=timezone.now())
+        _refresh_search(book_ids)
+    bump_cache_version('catalog')
+    return len(book_ids)
@@ -0,0 +1,75 @@
+# backend/catalog/facets.py
+"""
+Facet counts for the storefront filter sidebar.
+
+compute_facets() takes the already-filtered Book queryset and returns the
+number of matching books per category, tag, language, file format and
+price bucket, using one grouped aggregate query per facet.
+"""
+
+from django.db.models import Count, Q
+
+from .models import Book
+
+
+# (min, max) price ranges; max=None means "and up". Lower bound inclusive,
+# upper bound exclusive, so every book lands in exactly one bucket.
+PRICE_BUCKETS = [
+    (0, 100),
+    (100, 300),
+    (300, 500),
+    (500, 1000),
+    (1000, None),
+]
+
+
+def _bucket_key(low, high):
+    return f'{low}-{high}' if high is not None else f'{low}+'
+
+
+def _through_counts(through, field, book_ids):
+    # categories / tags: count rows in the M2M table, grouped by target
+    return [
+        {'id': row[f'{field}_id'], 'name': row[f'{field}__name'],
+         'slug': row[f'{field}__slug'], 'count': row['count']}
+        for row in (
+            through.objects.filter(book_id__in=book_ids)
+            .values(f'{field}_id', f'{field}__name', f'{field}__slug')
+            .annotate(count=Count('book_id'))
+            .order_by('-count', f'{field}__name')
+        )
+    ]
+
+
+def _value_counts(books, field):
+    return [
+        {'value': row[field], 'count': row['count']}
+        for row in books.values(field).annotate(count=Count('pk')).order_by('-count', field)
+        if row[field]
+    ]
+
+
+def compute_facets(queryset):
+    # filters on M2M fields can duplicate rows; work on the distinct ids
+    book_ids = queryset.order_by().values('pk')
+    books = Book.objects.filter(pk__in=book_ids).order_by()
+
+    price_counts = books.aggregate(**{
+        _bucket_key(low, high): Count(
+            'pk',
+            filter=Q(effective_price__gte=low)
+            & (Q(effective_price__lt=high) if high is not None else Q()),
+        )
+        for low, high in PRICE_BUCKETS
+    })
+
+    return {
+        'categories': _through_counts(Book.categories.through, 'category', book_ids),
+        'tags': _through_counts(Book.tags.through, 'tag', book_ids),
+        'language': _value_counts(books, 'language'),
+        'file_format': _value_counts(books, 'file_format'),
+        'price': [
+            {'min': low, 'max': high, 'count': price_counts[_bucket_key(low, high)]}
+            for low, high in PRICE_BUCKETS
+        ],
+    }
@@ -0,0 +1,136 @@
+# backend/catalog/files.py
+"""
+Content-addressed storage for ebook files.
+
+Uploads are hashed while they stream past (SHA-256 over `File.chunks()`,
+the same pass validate_ebook_file_size makes) and stored as
+
+    <upload_to><first 2 hex chars>/<sha256><ext>
+
+so re-uploading identical bytes stores nothing new and a name always
+identifies its content. The digest and byte size are copied to sibling
+model fields, which lets the download view send a strong ETag and a
+Content-Length without asking the storage backend (stat / remote HEAD).
+"""
+
+import hashlib
+import os
+
+from django.db import models
+from django.db.models import signals
+from django.db.models.fields.files import FieldFile
+
+
+def file_digest(file):
+    """
+    -> (sha256 hex digest, size in bytes) of an uploaded/opened File.
+    Memoized on the upload, so validators (which see either the upload or
+    a FieldFile wrapping it) and the field share one read of the content.
+    """
+    if isinstance(file, FieldFile) and not file._committed:
+        file = file.file
+    cached = getattr(file, '_content_digest', None)
+    if cached is not None:
+        return cached
+
+    sha256 = hashlib.sha256()
+    size = 0
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    for chunk in file.chunks():
+        sha256.update(chunk)
+        size += len(chunk)
+    if hasattr(file, 'seek'):
+        file.seek(0)
+
+    file._content_digest = (sha256.hexdigest(), size)
+    return file._content_digest
+
+
+def content_name(upload_to, digest, filename):
+    ext = os.path.splitext(filename)[1].lower()
+    return f'{upload_to.rstrip("/")}/{digest[:2]}/{digest}{ext}'
+
+
+def with_metadata_fields(model_instance, update_fields):
+    """
+    `update_fields` plus the digest/size fields of every listed
+    ContentAddressedFileField, for Model.save(update_fields=...).
+    """
+    fields = set(update_fields)
+    for field in model_instance._meta.concrete_fields:
+        if isinstance(field, ContentAddressedFileField) and field.name in fields:
+            fields.update(name for name in (field.digest_field, field.size_field) if name)
+    return fields
+
+
+class ContentAddressedFileField(models.FileField):
+    """
+    FileField that stores new uploads under their SHA-256 and fills
+    `digest_field` / `size_field` on the instance.
+
+    The upload is stored from a pre_save signal, i.e. before Django
+    collects any field values, so the metadata fields may be declared in
+    any order. A model saving with update_fields should pass them through
+    with_metadata_fields().
+    """
+
+    def __init__(self, *args, digest_field=None, size_field=None, **kwargs):
+        self.digest_field = digest_field
+        self.size_field = size_field
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.digest_field:
+            kwargs['digest_field'] = self.digest_field
+        if self.size_field:
+            kwargs['size_field'] = self.size_field
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+        if not cls._meta.abstract:
+            signals.pre_save.connect(self.store_upload, sender=cls, weak=False)
+
+    def store_upload(self, sender, instance, raw=False, **kwargs):
+        if not raw:
+            self.pre_save(instance, add=instance._state.adding)
+
+    def pre_save(self, model_instance, add):
+        # also reached directly by bulk_create(), which sends no signals
+        file = getattr(model_instance, self.attname)
+        if file and not file._committed:
+            digest, size = file_digest(file)
+            name = content_name(self.upload_to, digest, file.name)
+            if file.storage.exists(name):
+                # same bytes are already stored; just point at them
+                file.name = name
+                file._committed = True
+            else:
+                file.name = file.storage.save(name, file.file, max_length=self.max_length)
+                file._committed = True
+            self.set_metadata(model_instance, digest, size)
+        elif not file:
+            self.set_metadata(model_instance, '', None)
+        return file
+
+    def set_metadata(self, model_instance, digest, size):
+        if self.digest_field:
+            setattr(model_instance, self.digest_field, digest)
+        if self.size_field:
+            setattr(model_instance, self.size_field, size)
+
+
+def relocate(fieldfile, upload_to):
+    """
+    Move an already stored file to its content-addressed name (reusing
+    an identical stored copy if there is one). Returns (name, digest, size);
+    the caller saves the new name on the model and may delete the old file.
+    """
+    with fieldfile.open('rb'):
+        digest, size = file_digest(fieldfile)
+        name = content_name(upload_to, digest, fieldfile.name)
+        if name != fieldfile.name and not fieldfile.storage.exists(name):
+            name = fieldfile.storage.save(name, fieldfile.file)
+    return name, digest, size
@@ -1,13 +1,15 @@
 # backend/catalog/filters.py
 
 import django_filters
-from .models import Book
+from django.db.models import Subquery
+from rest_framework.filters import OrderingFilter
+from .models import Book, Category
 
 
 class BookFilter(django_filters.FilterSet):
-    # price range: ?min_price=100&max_price=500
-    min_price = django_filters.NumberFilter(field_name='price', lookup_expr='gte')
-    max_price = django_filters.NumberFilter(field_name='price', lookup_expr='lte')
+    # price range on what the customer pays: ?min_price=100&max_price=500
+    min_price = django_filters.NumberFilter(field_name='effective_price', lookup_expr='gte')
+    max_price = django_filters.NumberFilter(field_name='effective_price', lookup_expr='lte')
 
     # discount price range (optional)
     min_discount_price = django_filters.NumberFilter(
@@ -21,9 +23,27 @@ class BookFilter(django_filters.FilterSet):
     language = django_filters.CharFilter(field_name='language', lookup_expr='iexact')
 
     # categories & tags by slug:
-    category = django_filters.CharFilter(field_name='categories__slug', lookup_expr='iexact')
+    category = django_filters.CharFilter(method='filter_category')
     tag = django_filters.CharFilter(field_name='tags__slug', lookup_expr='iexact')
 
+    # ?category=fiction&descendants=true -> also books in sub-categories
+    descendants = django_filters.BooleanFilter(method='filter_noop')
+
+    def filter_category(self, queryset, name, value):
+        if not self.form.cleaned_data.get('descendants'):
+            return queryset.filter(categories__slug__iexact=value)
+
+        # one query: match the category's materialized path prefix
+        path = Category.objects.filter(slug__iexact=value).values('path')[:1]
+        book_ids = Book.categories.through.objects.filter(
+            category__path__startswith=Subquery(path)
+        ).values('book_id')
+        return queryset.filter(pk__in=book_ids)
+
+    def filter_noop(self, queryset, name, value):
+        # read by filter_category
+        return queryset
+
     class Meta:
         model = Book
         fields = [
@@ -32,3 +52,20 @@ class BookFilter(django_filters.FilterSet):
             'category',
             'tag',
         ]
+
+
+class BookOrderingFilter(OrderingFilter):
+    """
+    ?ordering=price sorts by what the customer pays (effective_price);
+    ?ordering=list_price sorts by the undiscounted list price.
+    """
+    aliases = {'price': 'effective_price', 'list_price': 'price'}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        return [
+            ('-' if term.startswith('-') else '') + self.aliases.get(term.lstrip('-'), term.lstrip('-'))
+            for term in ordering
+        ]
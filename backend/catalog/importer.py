@@ -0,0 +1,340 @@
+# backend/catalog/importer.py
+"""
+Bulk catalog import (used by `manage.py import_catalog`).
+
+Records are read one at a time from JSON Lines or CSV and written in
+chunks; each chunk is one transaction:
+
+  1. missing authors / tags / categories are bulk-created, everything else
+     is resolved through in-memory name -> id maps
+  2. books are upserted by slug with bulk_create(update_conflicts=True)
+  3. M2M rows of the chunk's books are replaced with bulk deletes/inserts
+  4. search documents of the chunk are rebuilt in one statement
+
+Bulk writes skip model signals, so caches and the autocomplete index are
+invalidated explicitly.
+
+A record looks like:
+
+  {"title": "...", "slug": "...", "description": "...", "price": "250",
+   "discount_price": "200", "authors": ["Humayun Ahmed"],
+   "categories": ["Fiction"], "tags": ["classic"], "language": "Bangla",
+   "file_format": "pdf", "isbn": "...", "pages": 200,
+   "publication_date": "2020-01-31", "is_published": true}
+
+In CSV, list columns are separated by "|".
+"""
+
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+from django.utils.text import slugify
+
+from core.cache import bump_cache_version
+from .autocomplete import autocomplete_index
+from .models import Author, Book, Category, Tag
+from .search import update_search_index
+from .validators import RESERVED_BOOK_SLUGS, unreserved_book_slug
+
+
+LIST_SEPARATOR = '|'
+RELATIONS = ('authors', 'categories', 'tags')
+
+# columns overwritten when an existing slug is imported again
+UPDATE_FIELDS = [
+    'title', 'description', 'price', 'discount_price', 'currency', 'isbn',
+    'language', 'pages', 'file_format', 'publication_date', 'is_published',
+    'updated_at',
+]
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 't'}
+
+# checked against the model field's validators (max_length, max_digits /
+# decimal_places, integer range), so a bad value skips its record instead
+# of failing the whole chunk's INSERT (DataError on PostgreSQL)
+CHECKED_FIELDS = ['currency', 'isbn', 'language', 'price', 'discount_price', 'pages']
+
+
+class RecordError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=10000)
+def make_slug(text):
+    # Bangla titles slugify to '' without allow_unicode
+    return slugify(text) or slugify(text, allow_unicode=True)
+
+
+def read_jsonl(stream):
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if line:
+            try:
+                yield line_no, json.loads(line)
+            except ValueError as exc:
+                yield line_no, RecordError(f'invalid JSON: {exc}')
+
+
+def read_csv(stream):
+    for row_no, row in enumerate(csv.DictReader(stream), 2):
+        record = {key: value for key, value in row.items() if key and value != ''}
+        for name in RELATIONS:
+            if name in record:
+                record[name] = [v.strip() for v in record[name].split(LIST_SEPARATOR) if v.strip()]
+        yield row_no, record
+
+
+def _names(value):
+    if isinstance(value, str):
+        value = [value]
+    return list(dict.fromkeys(str(v).strip() for v in value or () if str(v).strip()))
+
+
+def _decimal(value, field, required=False):
+    if value in (None, ''):
+        if required:
+            raise RecordError(f'{field} is required')
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        raise RecordError(f'invalid {field}: {value!r}')
+
+
+def _check_fields(book):
+    for name in CHECKED_FIELDS:
+        field = Book._meta.get_field(name)
+        value = getattr(book, field.attname)
+        if value in field.empty_values:
+            continue
+        try:
+            field.run_validators(value)
+        except ValidationError as exc:
+            raise RecordError(f"invalid {name}: {' '.join(exc.messages)}")
+
+
+def parse_record(record):
+    """
+    Validate one raw record into (Book instance, {relation: [names]}).
+    """
+    if isinstance(record, RecordError):
+        raise record
+    if not isinstance(record, dict):
+        raise RecordError('record is not an object')
+
+    title = str(record.get('title') or '').strip()
+    if not title:
+        raise RecordError('title is required')
+    slug_length = Book._meta.get_field('slug').max_length
+    slug = str(record.get('slug') or unreserved_book_slug(make_slug(title)[:slug_length]))
+    if not slug:
+        raise RecordError('cannot derive a slug from the title')
+    if len(slug) > slug_length:
+        raise RecordError(f'slug is longer than {slug_length} characters')
+    if slug in RESERVED_BOOK_SLUGS:
+        raise RecordError(f'slug {slug!r} is reserved')
+
+    file_format = str(record.get('file_format') or Book.FileFormat.PDF).lower()
+    if file_format not in Book.FileFormat.values:
+        raise RecordError(f'invalid file_format: {file_format!r}')
+
+    publication_date = record.get('publication_date')
+    if publication_date:
+        publication_date = parse_date(str(publication_date))
+        if publication_date is None:
+            raise RecordError(f"invalid publication_date: {record['publication_date']!r}")
+
+    pages = record.get('pages')
+    try:
+        pages = int(pages) if pages not in (None, '') else None
+    except (TypeError, ValueError):
+        raise RecordError(f'invalid pages: {pages!r}')
+
+    is_published = record.get('is_published', True)
+    if isinstance(is_published, str):
+        is_published = is_published.strip().lower() in TRUE_VALUES
+
+    book = Book(
+        title=title[:255],
+        slug=slug,
+        description=record.get('description') or '',
+        price=_decimal(record.get('price'), 'price', required=True),
+        discount_price=_decimal(record.get('discount_price'), 'discount_price'),
+        currency=str(record.get('currency') or 'BDT'),
+        isbn=str(record.get('isbn') or ''),
+        language=str(record.get('language') or 'Bangla'),
+        pages=pages,
+        file_format=file_format,
+        publication_date=publication_date or None,
+        is_published=bool(is_published),
+    )
+    _check_fields(book)
+    relations = {name: _names(record[name]) for name in RELATIONS if name in record}
+    return book, relations
+
+
+class CatalogImporter:
+    def __init__(self, batch_size=1000, stderr=None):
+        self.batch_size = batch_size
+        self.stderr = stderr
+        self.imported = 0
+        self.skipped = 0
+        self.created = {'authors': 0, 'categories': 0, 'tags': 0}
+
+        # name -> id lookup maps, loaded once
+        self.author_ids = {}
+        for pk, name in Author.objects.order_by('pk').values_list('pk', 'name'):
+            self.author_ids.setdefault(name.casefold(), pk)
+        self.category_ids = dict(Category.objects.values_list('slug', 'pk'))
+        # tags are unique by name and by slug, and an existing slug needn't
+        # be make_slug(name) (e.g. 'C#' -> 'csharp'): key them both ways
+        tags = list(Tag.objects.values_list('pk', 'name', 'slug'))
+        self.tag_ids = {make_slug(name): pk for pk, name, _ in tags}
+        self.tag_ids.update((slug, pk) for pk, _, slug in tags)
+
+    def run(self, records):
+        records = iter(records)
+        try:
+            while True:
+                chunk = list(islice(records, self.batch_size))
+                if not chunk:
+                    break
+                self.import_chunk(chunk)
+        finally:
+            if self.imported:
+                bump_cache_version('catalog')
+
+    def _warn(self, message):
+        if self.stderr is not None:
+            self.stderr.write(message)
+
+    # ---- lookups ----
+
+    def _resolve(self, model, ids, names, key, build):
+        """
+        Create the rows for `names` not in `ids` yet; returns them.
+        """
+        missing = {}
+        for name in names:
+            k = key(name)
+            if k and k not in ids and k not in missing:
+                missing[k] = build(name, k)
+        if missing:
+            # keyed by the lookup key: the built row may hold a truncated name
+            for k, obj in zip(missing, model.objects.bulk_create(missing.values())):
+                ids[k] = obj.pk
+        return list(missing.values())
+
+    def _resolve_tags(self, names):
+        """
+        Like _resolve(), but a new tag can still collide with an existing
+        one on the other unique field (same truncated name, or a slug that
+        some other name already took): insert with ignore_conflicts and
+        read the ids back by slug and name. Returns the number created.
+        """
+        missing = {}
+        for name in names:
+            k = make_slug(name)
+            if k and k not in self.tag_ids and k not in missing:
+                missing[k] = Tag(name=name[:50].strip(), slug=k[:60])
+        if not missing:
+            return 0
+
+        Tag.objects.bulk_create(missing.values(), ignore_conflicts=True)
+        by_slug = {tag.slug: k for k, tag in missing.items()}
+        by_name = {tag.name: k for k, tag in missing.items()}
+        created = 0
+        rows = Tag.objects.filter(
+            Q(slug__in=by_slug) | Q(name__in=by_name)
+        ).values_list('pk', 'name', 'slug')
+        for pk, name, slug in rows:
+            if slug in by_slug:
+                k = by_slug[slug]
+                self.tag_ids[k] = pk
+                created += missing[k].name == name
+            elif name in by_name:
+                self.tag_ids.setdefault(by_name[name], pk)
+        return created
+
+    def _resolve_lookups(self, relations):
+        names = {name: set() for name in RELATIONS}
+        for rel in relations:
+            for name, values in rel.items():
+                names[name].update(values)
+
+        authors = self._resolve(
+            Author, self.author_ids, names['authors'],
+            key=str.casefold, build=lambda name, k: Author(name=name[:255]),
+        )
+        created_tags = self._resolve_tags(names['tags'])
+        categories = self._resolve(
+            Category, self.category_ids, names['categories'],
+            key=make_slug, build=lambda name, k: Category(name=name[:255], slug=k[:255]),
+        )
+        if categories:
+            # new categories are roots; fill in their materialized path
+            Category.rebuild_tree_fields(categories)
+
+        self.created['authors'] += len(authors)
+        self.created['tags'] += created_tags
+        self.created['categories'] += len(categories)
+
+    def _relation_ids(self, name, values):
+        if name == 'authors':
+            return {self.author_ids[v.casefold()] for v in values}
+        lookup = self.category_ids if name == 'categories' else self.tag_ids
+        return {lookup[make_slug(v)] for v in values if make_slug(v)}
+
+    # ---- writing ----
+
+    def import_chunk(self, chunk):
+        books = {}
+        for position, record in chunk:
+            try:
+                book, relations = parse_record(record)
+            except RecordError as exc:
+                self.skipped += 1
+                self._warn(f'line {position}: skipped ({exc})')
+                continue
+            # last record wins when a slug repeats inside the chunk
+            books[book.slug] = (book, relations)
+
+        if not books:
+            return
+
+        with transaction.atomic():
+            self._resolve_lookups(rel for _, rel in books.values())
+
+            Book.objects.bulk_create(
+                [book for book, _ in books.values()],
+                update_conflicts=True,
+                unique_fields=['slug'],
+                update_fields=UPDATE_FIELDS,
+            )
+            book_ids = dict(Book.objects.filter(slug__in=books).values_list('slug', 'pk'))
+
+            for name in RELATIONS:
+                field = Book._meta.get_field(name)
+                through = field.remote_field.through
+                target = field.m2m_reverse_field_name() + '_id'
+                replaced = [book_ids[slug] for slug, (_, rel) in books.items() if name in rel]
+                if not replaced:
+                    continue
+                through.objects.filter(book_id__in=replaced).delete()
+                through.objects.bulk_create([
+                    through(book_id=book_ids[slug], **{target: related_id})
+                    for slug, (_, rel) in books.items() if name in rel
+                    for related_id in self._relation_ids(name, rel[name])
+                ])
+
+            update_search_index(book_ids.values())
+
+        autocomplete_index.refresh_books(book_ids.values())
+        self.imported += len(book_ids)
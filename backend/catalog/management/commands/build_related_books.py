@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from catalog.recommendations import MIN_SUPPORT, TOP_K, build_related_books
+
+
+class Command(BaseCommand):
+    help = "Rebuild the related-books table from co-purchases and tag/category overlap."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=TOP_K,
+            help=f"Neighbours stored per book (default: {TOP_K})",
+        )
+        parser.add_argument(
+            "--min-support",
+            type=int,
+            default=MIN_SUPPORT,
+            help=f"Minimum common buyers for a co-purchase pair (default: {MIN_SUPPORT})",
+        )
+
+    def handle(self, *args, **options):
+        count = build_related_books(
+            top_k=options["top_k"], min_support=options["min_support"]
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored related books for {count} books.")
+        )
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from catalog.files import file_digest, relocate
+from catalog.models import Book
+
+
+# (file field, digest field, size field)
+FILE_FIELDS = [
+    ("file", "file_sha256", "file_size"),
+    ("sample_file", "sample_sha256", "sample_size"),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Record SHA-256 and size of stored ebook/sample files, "
+        "optionally moving them to content-addressed names."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--relocate",
+            action="store_true",
+            help="Move files to <upload_to>/<xx>/<sha256>.<ext> and drop duplicates",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rehash files that already have a digest",
+        )
+
+    def handle(self, *args, **options):
+        for field_name, digest_field, size_field in FILE_FIELDS:
+            field = Book._meta.get_field(field_name)
+            queryset = Book.objects.exclude(**{field_name: ""}).exclude(**{f"{field_name}__isnull": True})
+            if not options["force"]:
+                queryset = queryset.filter(Q(**{digest_field: ""}) | Q(**{f"{size_field}__isnull": True}))
+
+            done = missing = removed = 0
+            for book in queryset.only("pk", field_name).order_by("pk").iterator(chunk_size=100):
+                fieldfile = getattr(book, field_name)
+                old_name = fieldfile.name
+                try:
+                    if options["relocate"]:
+                        name, digest, size = relocate(fieldfile, field.upload_to)
+                    else:
+                        with fieldfile.open("rb"):
+                            name, (digest, size) = old_name, file_digest(fieldfile)
+                except OSError:
+                    missing += 1
+                    continue
+
+                Book.objects.filter(pk=book.pk).update(
+                    **{field_name: name, digest_field: digest, size_field: size}
+                )
+                done += 1
+                if name != old_name and not Book.objects.filter(**{field_name: old_name}).exists():
+                    fieldfile.storage.delete(old_name)
+                    removed += 1
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{field_name}: hashed {done} files, removed {removed} old copies "
+                    f"({missing} could not be read)."
+                )
+            )
@@ -0,0 +1,56 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.importer import CatalogImporter, read_csv, read_jsonl
+
+
+READERS = {
+    'jsonl': read_jsonl,
+    'csv': read_csv,
+}
+
+
+class Command(BaseCommand):
+    help = "Import or update books from a JSON Lines or CSV feed (upsert by slug)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to a .jsonl or .csv file")
+        parser.add_argument(
+            "--format",
+            choices=sorted(READERS),
+            help="Input format (default: guessed from the file extension)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Books written per transaction (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"]
+        if fmt is None:
+            ext = os.path.splitext(path)[1].lower().lstrip(".")
+            fmt = {"ndjson": "jsonl", "jsonl": "jsonl", "csv": "csv"}.get(ext)
+            if fmt is None:
+                raise CommandError("Cannot guess the format from the extension; pass --format.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        importer = CatalogImporter(batch_size=options["batch_size"], stderr=self.stderr)
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as stream:
+                importer.run(READERS[fmt](stream))
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+
+        created = importer.created
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {importer.imported} books ({importer.skipped} skipped); "
+                f"created {created['authors']} authors, {created['categories']} categories "
+                f"and {created['tags']} tags."
+            )
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from catalog.models import Book
+from catalog.search import update_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search documents for every book."
+
+    def handle(self, *args, **options):
+        update_search_index()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt search index for {Book.objects.count()} books.")
+        )
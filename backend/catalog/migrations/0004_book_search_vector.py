@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:54
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from catalog.search import create_search_index, update_search_index
+
+    create_search_index(schema_editor.connection)
+    update_search_index(using=schema_editor.connection.alias)
+
+
+def drop_search_index(apps, schema_editor):
+    from catalog.search import drop_search_index
+
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_book_pdf_password'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
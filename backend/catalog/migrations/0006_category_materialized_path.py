@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:01
+
+from django.db import migrations, models
+
+
+def populate_tree_fields(apps, schema_editor):
+    Category = apps.get_model('catalog', 'Category')
+    categories = list(Category.objects.all())
+    children = {}
+    for category in categories:
+        children.setdefault(category.parent_id, []).append(category)
+
+    # breadth-first from the roots, so parents are filled in first
+    level = [(None, c) for c in children.get(None, [])]
+    while level:
+        next_level = []
+        for parent, category in level:
+            if parent is None:
+                category.path, category.depth, category.full_name = f'{category.pk}/', 0, category.name
+            else:
+                category.path = f'{parent.path}{category.pk}/'
+                category.depth = parent.depth + 1
+                category.full_name = f'{parent.full_name} → {category.name}'
+            next_level += [(category, c) for c in children.get(category.pk, [])]
+        level = next_level
+
+    Category.objects.bulk_update(categories, ['path', 'depth', 'full_name'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='full_name',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(populate_tree_fields, migrations.RunPython.noop),
+    ]
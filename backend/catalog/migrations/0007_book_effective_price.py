@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:14
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_category_materialized_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='effective_price',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=django.db.models.functions.comparison.Coalesce(django.db.models.functions.comparison.NullIf('discount_price', models.Value(0)), 'price'), output_field=models.DecimalField(decimal_places=2, max_digits=10)),
+        ),
+    ]
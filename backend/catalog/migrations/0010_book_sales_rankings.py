@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0009_relatedbook'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='sales_30d',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='sales_7d',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='trending_score',
+            field=models.FloatField(db_index=True, default=0, editable=False),
+        ),
+    ]
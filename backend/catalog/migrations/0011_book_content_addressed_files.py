@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:31
+
+import catalog.files
+import catalog.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0010_book_sales_rankings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='file_sha256',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='file_size',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='sample_sha256',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='sample_size',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='book',
+            name='file',
+            field=catalog.files.ContentAddressedFileField(blank=True, digest_field='file_sha256', null=True, size_field='file_size', upload_to='books/files/', validators=[catalog.validators.validate_ebook_file_extension, catalog.validators.validate_ebook_file_size]),
+        ),
+        migrations.AlterField(
+            model_name='book',
+            name='sample_file',
+            field=catalog.files.ContentAddressedFileField(blank=True, digest_field='sample_sha256', null=True, size_field='sample_size', upload_to='books/samples/'),
+        ),
+    ]
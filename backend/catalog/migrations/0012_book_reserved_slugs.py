@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:03
+
+import catalog.validators
+from django.db import migrations, models
+
+
+def rename_reserved_slugs(apps, schema_editor):
+    # these books were shadowed by the list-level actions; give them a
+    # reachable slug (the id keeps it unique)
+    Book = apps.get_model('catalog', 'Book')
+    for book in Book.objects.filter(slug__in=catalog.validators.RESERVED_BOOK_SLUGS):
+        book.slug = f'{book.slug}-{book.pk}'
+        book.save(update_fields=['slug'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0011_book_content_addressed_files'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_reserved_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='book',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=255, unique=True, validators=[catalog.validators.validate_book_slug]),
+        ),
+    ]
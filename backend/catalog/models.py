@@ -2,9 +2,16 @@
 
 from django.db import models
 from django.utils.text import slugify
-from .validators import validate_ebook_file_extension, validate_ebook_file_size
+from .files import ContentAddressedFileField, with_metadata_fields
+from .validators import (
+    validate_book_slug, validate_ebook_file_extension, validate_ebook_file_size,
+    unreserved_book_slug,
+)
 from core.models import TimeStampedModel
-from django.db.models import Avg, Count
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db.models import F, FloatField, IntegerField, Value
+from django.db.models.functions import Coalesce, NullIf
 
 class Author(TimeStampedModel):
     name = models.CharField(max_length=255)
@@ -26,18 +33,84 @@ class Category(TimeStampedModel):
         blank=True
     )
 
+    # materialized path, maintained on save: ancestor ids + own id, e.g.
+    # "3/17/42/". Descendants of X are path__startswith=X.path.
+    path = models.CharField(max_length=255, db_index=True, blank=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    # breadcrumb, e.g. "Fiction → Thriller"
+    full_name = models.TextField(blank=True, editable=False)
+
+    BREADCRUMB_SEPARATOR = ' → '
+
     class Meta:
         verbose_name_plural = 'categories'
 
+    def clean(self):
+        if self.pk and self.parent_id:
+            parent = self.parent
+            if parent.pk == self.pk or (self.path and parent.path.startswith(self.path)):
+                raise ValidationError({'parent': 'A category cannot be moved under itself.'})
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+        old_path = self.path
         super().save(*args, **kwargs)
 
+        # the path includes our own id, so it can only be set after saving;
+        # this also re-roots the subtree when parent or name changed
+        subtree = [self]
+        if old_path:
+            subtree += list(
+                Category.objects.filter(path__startswith=old_path)
+                .exclude(pk=self.pk)
+                .order_by('depth')
+            )
+        Category.rebuild_tree_fields(subtree)
+
+    @classmethod
+    def rebuild_tree_fields(cls, categories):
+        """
+        Recompute path/depth/full_name for `categories` (parents before
+        children) and write back the rows that changed.
+        """
+        fresh = {}
+        outside = {c.parent_id for c in categories} - {c.pk for c in categories} - {None}
+        parents = cls.objects.in_bulk(outside)
+
+        changed = []
+        for category in categories:
+            parent = fresh.get(category.parent_id) or parents.get(category.parent_id)
+            if parent is not None:
+                values = (
+                    f'{parent.path}{category.pk}/',
+                    parent.depth + 1,
+                    f'{parent.full_name}{cls.BREADCRUMB_SEPARATOR}{category.name}',
+                )
+            else:
+                values = (f'{category.pk}/', 0, category.name)
+
+            if values != (category.path, category.depth, category.full_name):
+                category.path, category.depth, category.full_name = values
+                changed.append(category)
+            fresh[category.pk] = category
+
+        cls.objects.bulk_update(changed, ['path', 'depth', 'full_name'])
+
+    @property
+    def parent_full_name(self):
+        if not self.parent_id:
+            return None
+        # full_name is stored as "<parent's full_name><separator><name>", so
+        # without a loaded parent its breadcrumb is that prefix. Never split
+        # on the separator: a name may contain it.
+        suffix = f'{self.BREADCRUMB_SEPARATOR}{self.name}'
+        if Category.parent.is_cached(self) or not self.full_name.endswith(suffix):
+            return self.parent.full_name
+        return self.full_name[:-len(suffix)]
+
     def __str__(self):
-        if self.parent:
-            return f"{self.parent} → {self.name}"
-        return self.name
+        return self.full_name or self.name
 
 
 class Tag(TimeStampedModel):
@@ -53,6 +126,32 @@ class Tag(TimeStampedModel):
         return self.name
 
 
+class BookQuerySet(models.QuerySet):
+    def with_rating_stats(self):
+        """
+        Annotate rating_avg / rating_count from the denormalized
+        reviews.BookRatingStats row (a plain LEFT JOIN, no aggregation).
+        """
+        return self.annotate(
+            rating_avg=Coalesce(F('rating_stats__average'), 0.0, output_field=FloatField()),
+            rating_count=Coalesce(F('rating_stats__rating_count'), 0, output_field=IntegerField()),
+        )
+
+    def for_listing(self):
+        """
+        Everything BookListSerializer touches, in a fixed number of queries.
+        """
+        return self.with_rating_stats().prefetch_related(
+            'authors', 'categories', 'tags'
+        )
+
+    def for_card(self):
+        """
+        Everything BookCardSerializer touches.
+        """
+        return self.with_rating_stats().prefetch_related('authors')
+
+
 class Book(TimeStampedModel):
     class FileFormat(models.TextChoices):
         PDF = 'pdf', 'PDF'
@@ -61,14 +160,21 @@ class Book(TimeStampedModel):
         OTHER = 'other', 'Other'
 
     title = models.CharField(max_length=255)
-    slug = models.SlugField(max_length=255, unique=True, blank=True)
+    slug = models.SlugField(
+        max_length=255, unique=True, blank=True, validators=[validate_book_slug]
+    )
     description = models.TextField()
-    file = models.FileField(
+    # stored under their SHA-256 (catalog.files), digest/size kept alongside
+    file = ContentAddressedFileField(
         upload_to='books/files/',
         validators=[validate_ebook_file_extension, validate_ebook_file_size],
         blank=True,
         null=True,
+        digest_field='file_sha256',
+        size_field='file_size',
     )
+    file_sha256 = models.CharField(max_length=64, blank=True, db_index=True, editable=False)
+    file_size = models.PositiveBigIntegerField(blank=True, null=True, editable=False)
 
     pdf_password = models.CharField(
         max_length=64,
@@ -81,10 +187,28 @@ class Book(TimeStampedModel):
     tags = models.ManyToManyField(Tag, related_name='books', blank=True)
 
     cover_image = models.ImageField(upload_to="books/covers/", blank=True, null=True)
-    sample_file = models.FileField(upload_to="books/samples/", blank=True, null=True)
+    # responsive WebP derivatives of cover_image (core.images)
+    cover_image_thumbnails = models.JSONField(default=dict, blank=True, editable=False)
+    sample_file = ContentAddressedFileField(
+        upload_to="books/samples/",
+        blank=True,
+        null=True,
+        digest_field='sample_sha256',
+        size_field='sample_size',
+    )
+    sample_sha256 = models.CharField(max_length=64, blank=True, editable=False)
+    sample_size = models.PositiveBigIntegerField(blank=True, null=True, editable=False)
 
     price = models.DecimalField(max_digits=10, decimal_places=2)
     discount_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    # what the customer pays: discount_price unless it's empty/0, else price.
+    # Stored generated column, so filters/ordering on it are index scans.
+    effective_price = models.GeneratedField(
+        expression=Coalesce(NullIf('discount_price', Value(0)), 'price'),
+        output_field=models.DecimalField(max_digits=10, decimal_places=2),
+        db_persist=True,
+        db_index=True,
+    )
     currency = models.CharField(max_length=10, default='BDT')
 
     isbn = models.CharField(max_length=20, blank=True)
@@ -96,25 +220,69 @@ class Book(TimeStampedModel):
 
     is_published = models.BooleanField(default=True)
 
+    # sales rankings, maintained by orders.sales (bumped on each paid order,
+    # windows/decay recomputed daily by `manage.py refresh_sales_rankings`)
+    sales_7d = models.PositiveIntegerField(default=0, db_index=True, editable=False)
+    sales_30d = models.PositiveIntegerField(default=0, editable=False)
+    trending_score = models.FloatField(default=0, db_index=True, editable=False)
+
+    # weighted full-text document, maintained by catalog.search (PostgreSQL only)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = BookQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # keyset pagination (core.pagination.KeysetPagination)
+            models.Index(fields=['created_at', 'id'], name='book_created_id_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.title)
+            self.slug = unreserved_book_slug(slugify(self.title))
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = with_metadata_fields(self, kwargs['update_fields'])
         super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
 
-    @property
-    def effective_price(self):
-        return self.discount_price if self.discount_price else self.price
-
     @property
     def average_rating(self):
-        from reviews.models import Review
-        data = Review.objects.filter(book=self, is_approved=True).aggregate(avg=Avg('rating'))
-        return data['avg'] or 0
+        # use the annotation from with_rating_stats() when present
+        if hasattr(self, 'rating_avg'):
+            return self.rating_avg or 0
+        try:
+            return self.rating_stats.average
+        except ObjectDoesNotExist:
+            return 0
 
     @property
     def reviews_count(self):
-        from reviews.models import Review
-        return Review.objects.filter(book=self, is_approved=True).count()
\ No newline at end of file
+        if hasattr(self, 'rating_count'):
+            return self.rating_count
+        try:
+            return self.rating_stats.rating_count
+        except ObjectDoesNotExist:
+            return 0
+
+
+class RelatedBook(models.Model):
+    """
+    Precomputed "customers also bought" neighbours: the top-K books for
+    each book, from co-purchases blended with tag/category overlap.
+    Rebuilt offline by `manage.py build_related_books`.
+    """
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['book', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['book', 'rank'], name='related_book_rank_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.book} → {self.related} ({self.score:.3f})"
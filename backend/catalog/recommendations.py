@@ -0,0 +1,133 @@
+# backend/catalog/recommendations.py
+"""
+"Customers also bought" neighbours, computed offline.
+
+  1. co-purchase counts for every pair of books bought by the same user
+     come from one GROUP BY over a self-join of downloads.PurchaseItem,
+     so the heavy counting happens inside the database
+  2. pair scores are cosine-normalized: n(a,b) / sqrt(n(a) * n(b))
+  3. tag/category overlap (Jaccard) is blended in, which also gives
+     recommendations to books nobody has bought together yet. Shared
+     terms are counted by walking the postings of each book's terms
+     once, and only the best TOP_K per book are kept, so memory stays
+     proportional to books * TOP_K
+  4. the best TOP_K per book are written to catalog.RelatedBook
+
+Rebuild with `manage.py build_related_books`.
+"""
+
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, F
+
+from core.cache import bump_cache_version
+from .models import Book, RelatedBook
+
+
+TOP_K = 12
+# pairs bought together by fewer users than this are treated as noise
+MIN_SUPPORT = 2
+COPURCHASE_WEIGHT = 1.0
+CONTENT_WEIGHT = 0.3
+# tags/categories on more books than this say little about similarity
+# and would make the candidate sets quadratic; they're ignored
+MAX_TERM_BOOKS = 500
+
+
+def copurchase_counts(min_support=MIN_SUPPORT):
+    """
+    -> ({book_id: buyers}, {(a, b): buyers of both}) with a < b, keeping
+    pairs with at least `min_support` common buyers.
+    """
+    PurchaseItem = apps.get_model('downloads', 'PurchaseItem')
+    purchases = PurchaseItem.objects.filter(is_active=True)
+
+    buyers = dict(
+        purchases.order_by().values_list('book_id').annotate(n=Count('user_id'))
+    )
+    pairs = (
+        purchases.filter(
+            user__purchased_items__is_active=True,
+            user__purchased_items__book_id__gt=F('book_id'),
+        )
+        .order_by()
+        .values_list('book_id', 'user__purchased_items__book_id')
+        .annotate(n=Count('user_id'))
+        .filter(n__gte=min_support)
+    )
+    return buyers, {(a, b): n for a, b, n in pairs.iterator(chunk_size=10000)}
+
+
+def content_terms(book_ids):
+    terms = defaultdict(set)
+    sources = [
+        ('c', Book.categories.through.objects.values_list('book_id', 'category_id')),
+        ('t', Book.tags.through.objects.values_list('book_id', 'tag_id')),
+    ]
+    for kind, rows in sources:
+        for book_id, term_id in rows.iterator(chunk_size=10000):
+            if book_id in book_ids:
+                terms[book_id].add((kind, term_id))
+    return terms
+
+
+def compute_related(top_k=TOP_K, min_support=MIN_SUPPORT):
+    """
+    -> {book_id: [(related_id, score), ...]} best first.
+    """
+    published = set(Book.objects.filter(is_published=True).values_list('pk', flat=True))
+    buyers, pairs = copurchase_counts(min_support)
+
+    copurchase = defaultdict(dict)
+    for (a, b), n in pairs.items():
+        if a in published and b in published:
+            score = COPURCHASE_WEIGHT * n / math.sqrt(buyers[a] * buyers[b])
+            copurchase[a][b] = copurchase[b][a] = score
+
+    terms = content_terms(published)
+    postings = defaultdict(list)
+    for book_id, book_terms in terms.items():
+        for term in book_terms:
+            postings[term].append(book_id)
+
+    related = {}
+    for book_id in copurchase.keys() | terms.keys():
+        book_terms = terms.get(book_id, ())
+        # |terms(book) & terms(other)| for every other book sharing a term
+        shared = Counter()
+        for term in book_terms:
+            if len(postings[term]) <= MAX_TERM_BOOKS:
+                shared.update(postings[term])
+        shared.pop(book_id, None)
+
+        scores = dict(copurchase.get(book_id, {}))
+        for other, common in shared.items():
+            overlap = common / (len(book_terms) + len(terms[other]) - common)
+            scores[other] = scores.get(other, 0.0) + CONTENT_WEIGHT * overlap
+        if scores:
+            related[book_id] = heapq.nlargest(
+                top_k, scores.items(), key=lambda item: (item[1], -item[0])
+            )
+    return related
+
+
+def build_related_books(top_k=TOP_K, min_support=MIN_SUPPORT):
+    """
+    Replace the whole RelatedBook table; returns the number of books
+    that got recommendations.
+    """
+    related = compute_related(top_k, min_support)
+    rows = (
+        RelatedBook(book_id=book_id, related_id=other, rank=rank, score=score)
+        for book_id, neighbours in related.items()
+        for rank, (other, score) in enumerate(neighbours, 1)
+    )
+    with transaction.atomic():
+        RelatedBook.objects.all().delete()
+        RelatedBook.objects.bulk_create(rows, batch_size=5000)
+    bump_cache_version('related')
+    return len(related)
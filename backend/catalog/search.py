@@ -0,0 +1,204 @@
+# backend/catalog/search.py
+"""
+Full-text search for the book catalog.
+
+Each book gets a precomputed, weighted search document
+(title > authors > tags > description):
+
+  - PostgreSQL: Book.search_vector (tsvector) with a GIN index
+  - SQLite:     the catalog_book_fts FTS5 table (rowid = book id)
+  - anything else falls back to the old icontains search
+
+The documents are rebuilt with set-based SQL by update_search_index(),
+which catalog.signals calls whenever a Book, Author or Tag changes.
+"""
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Q
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+from .models import Book
+
+
+SEARCH_CONFIG = 'simple'  # no stemming: most titles are Bangla
+FTS_TABLE = 'catalog_book_fts'
+
+# bm25 column weights, in FTS table column order
+FTS_WEIGHTS = (10.0, 5.0, 3.0, 1.0)
+
+
+def _tables():
+    return {
+        'book': Book._meta.db_table,
+        'author': Book.authors.field.related_model._meta.db_table,
+        'book_authors': Book.authors.through._meta.db_table,
+        'tag': Book.tags.field.related_model._meta.db_table,
+        'book_tags': Book.tags.through._meta.db_table,
+        'fts': FTS_TABLE,
+        'config': SEARCH_CONFIG,
+    }
+
+
+# correlated subqueries: space-joined author/tag names of book `b`
+AUTHOR_NAMES_SQL = (
+    "(SELECT {agg}(a.name, ' ') FROM {author} a "
+    "JOIN {book_authors} ba ON ba.author_id = a.id WHERE ba.book_id = b.id)"
+)
+TAG_NAMES_SQL = (
+    "(SELECT {agg}(t.name, ' ') FROM {tag} t "
+    "JOIN {book_tags} bt ON bt.tag_id = t.id WHERE bt.book_id = b.id)"
+)
+
+POSTGRES_UPDATE_SQL = (
+    "UPDATE {book} b SET search_vector = "
+    "setweight(to_tsvector('{config}', coalesce(b.title, '')), 'A') || "
+    "setweight(to_tsvector('{config}', coalesce({author_names}, '')), 'B') || "
+    "setweight(to_tsvector('{config}', coalesce({tag_names}, '')), 'C') || "
+    "setweight(to_tsvector('{config}', coalesce(b.description, '')), 'D')"
+)
+
+SQLITE_INSERT_SQL = (
+    "INSERT INTO {fts} (rowid, title, authors, tags, description) "
+    "SELECT b.id, b.title, {author_names}, {tag_names}, b.description "
+    "FROM {book} b"
+)
+
+
+def _render(template, agg):
+    tables = _tables()
+    return template.format(
+        author_names=AUTHOR_NAMES_SQL.format(agg=agg, **tables),
+        tag_names=TAG_NAMES_SQL.format(agg=agg, **tables),
+        **tables,
+    )
+
+
+def create_search_index(connection):
+    """
+    Create the vendor-specific index structures (used by the migration).
+    """
+    tables = _tables()
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS catalog_book_search_vector_gin "
+                "ON {book} USING gin (search_vector)".format(**tables)
+            )
+        elif connection.vendor == 'sqlite':
+            # keep combining marks (Bangla vowel signs) inside tokens
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                "title, authors, tags, description, "
+                "tokenize = \"unicode61 categories 'L* N* Co M*'\")".format(**tables)
+            )
+
+
+def drop_search_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("DROP INDEX IF EXISTS catalog_book_search_vector_gin")
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def _id_clause(column, book_ids):
+    if book_ids is None:
+        return '', []
+    return f" WHERE {column} IN ({', '.join(['%s'] * len(book_ids))})", list(book_ids)
+
+
+def update_search_index(book_ids=None, using='default'):
+    """
+    Recompute the search documents of `book_ids` (all books when None).
+    """
+    if book_ids is not None:
+        book_ids = list(book_ids)
+        if not book_ids:
+            return
+
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            where, params = _id_clause('b.id', book_ids)
+            cursor.execute(_render(POSTGRES_UPDATE_SQL, 'string_agg') + where, params)
+        elif connection.vendor == 'sqlite':
+            where, params = _id_clause('rowid', book_ids)
+            cursor.execute(f"DELETE FROM {FTS_TABLE}" + where, params)
+            where, params = _id_clause('b.id', book_ids)
+            cursor.execute(_render(SQLITE_INSERT_SQL, 'group_concat') + where, params)
+
+
+def remove_from_search_index(book_ids, using='default'):
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or not book_ids:
+        # the tsvector column goes away with the row
+        return
+    where, params = _id_clause('rowid', book_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}" + where, params)
+
+
+def _fts_match_expression(terms):
+    # every whitespace-separated term as a quoted prefix query, AND-ed
+    words = [word.replace('"', '') for word in terms.split()]
+    return ' '.join(f'"{word}"*' for word in words if word)
+
+
+def search_books(queryset, terms):
+    """
+    Filter `queryset` to books matching `terms`, annotated with
+    `search_rank` and ordered by it (best match first).
+    """
+    vendor = connections[queryset.db].vendor
+
+    if vendor == 'postgresql':
+        query = SearchQuery(terms, search_type='websearch', config=SEARCH_CONFIG)
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(search_rank=SearchRank(F('search_vector'), query))
+            .order_by('-search_rank', 'pk')
+        )
+
+    if vendor == 'sqlite':
+        match = _fts_match_expression(terms)
+        if not match:
+            return queryset.none()
+        weights = ', '.join(str(w) for w in FTS_WEIGHTS)
+        book_table = Book._meta.db_table
+        return (
+            queryset.filter(
+                pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+            )
+            .annotate(
+                # bm25() is "lower is better"; negate so higher ranks first
+                search_rank=RawSQL(
+                    f"SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+                    f"WHERE {FTS_TABLE} MATCH %s AND rowid = {book_table}.id",
+                    [match],
+                    output_field=FloatField(),
+                )
+            )
+            .order_by('-search_rank', 'pk')
+        )
+
+    condition = Q()
+    for field in ('title', 'description', 'authors__name', 'tags__name'):
+        condition |= Q(**{f'{field}__icontains': terms})
+    return queryset.filter(condition).distinct()
+
+
+class BookSearchFilter(BaseFilterBackend):
+    """
+    Drop-in replacement for SearchFilter on BookViewSet (same ?search=
+    param) backed by the precomputed search documents.
+    """
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, '').replace('\x00', '').strip()
+        if not terms:
+            return queryset
+        return search_books(queryset, terms)
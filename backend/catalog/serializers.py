@@ -1,21 +1,23 @@
 # backend/catalog/serializers.py
 from rest_framework import serializers
 
+from core.serializers import DynamicFieldsMixin, SrcsetField, ThumbnailField
 from .models import Author, Category, Tag, Book
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Author
         fields = ['id', 'name', 'bio', 'website']
 
 
 class CategorySerializer(serializers.ModelSerializer):
-    parent = serializers.StringRelatedField(read_only=True)
+    # parent's breadcrumb, from the stored full_name values (no extra queries)
+    parent = serializers.CharField(source='parent_full_name', read_only=True)
 
     class Meta:
         model = Category
-        fields = ['id', 'name', 'slug', 'parent']
+        fields = ['id', 'name', 'slug', 'parent', 'full_name', 'depth']
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -24,7 +26,40 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug']
 
 
-class BookListSerializer(serializers.ModelSerializer):
+class BookCardSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Slim book representation for cards: ?view=card on the catalog and
+    the nested book in carts, orders and the library.
+    """
+    authors = AuthorSerializer(many=True, read_only=True, fields=['id', 'name'])
+    effective_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, read_only=True
+    )
+    average_rating = serializers.FloatField(read_only=True)
+    reviews_count = serializers.IntegerField(read_only=True)
+    cover_thumbnail = ThumbnailField(source='cover_image_thumbnails')
+    cover_srcset = SrcsetField(source='cover_image_thumbnails')
+
+    class Meta:
+        model = Book
+        fields = [
+            'id',
+            'title',
+            'slug',
+            'cover_image',
+            'cover_thumbnail',
+            'cover_srcset',
+            'price',
+            'discount_price',
+            'effective_price',
+            'currency',
+            'authors',
+            'average_rating',
+            'reviews_count',
+        ]
+
+
+class BookListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     authors = AuthorSerializer(many=True, read_only=True)
     categories = CategorySerializer(many=True, read_only=True)
     tags = TagSerializer(many=True, read_only=True)
@@ -33,6 +68,8 @@ class BookListSerializer(serializers.ModelSerializer):
     )
     average_rating = serializers.FloatField(read_only=True)
     reviews_count = serializers.IntegerField(read_only=True)
+    cover_thumbnail = ThumbnailField(source='cover_image_thumbnails')
+    cover_srcset = SrcsetField(source='cover_image_thumbnails')
 
     class Meta:
         model = Book
@@ -41,6 +78,8 @@ class BookListSerializer(serializers.ModelSerializer):
             'title',
             'slug',
             'cover_image',
+            'cover_thumbnail',
+            'cover_srcset',
             'price',
             'discount_price',
             'effective_price',
@@ -55,7 +94,7 @@ class BookListSerializer(serializers.ModelSerializer):
         ]
 
 
-class BookDetailSerializer(serializers.ModelSerializer):
+class BookDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     authors = AuthorSerializer(many=True, read_only=True)
     categories = CategorySerializer(many=True, read_only=True)
     tags = TagSerializer(many=True, read_only=True)
@@ -64,6 +103,8 @@ class BookDetailSerializer(serializers.ModelSerializer):
     )
     average_rating = serializers.FloatField(read_only=True)
     reviews_count = serializers.IntegerField(read_only=True)
+    cover_thumbnail = ThumbnailField(source='cover_image_thumbnails')
+    cover_srcset = SrcsetField(source='cover_image_thumbnails')
 
     class Meta:
         model = Book
@@ -76,6 +117,8 @@ class BookDetailSerializer(serializers.ModelSerializer):
             'categories',
             'tags',
             'cover_image',
+            'cover_thumbnail',
+            'cover_srcset',
             'file_format',
             'price',
             'discount_price',
@@ -97,8 +140,76 @@ class AdminBookSerializer(serializers.ModelSerializer):
     authors = serializers.PrimaryKeyRelatedField(many=True, queryset=Author.objects.all())
     categories = serializers.PrimaryKeyRelatedField(many=True, queryset=Category.objects.all())
     tags = serializers.PrimaryKeyRelatedField(many=True, queryset=Tag.objects.all())
+    effective_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, read_only=True
+    )
 
     class Meta:
         model = Book
-        fields = '__all__'
+        exclude = ['search_vector']
+
+
+class BulkSelectionSerializer(serializers.Serializer):
+    """
+    Which books a bulk admin action applies to: explicit ids, or all=true.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    all = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if not attrs.get('ids') and not attrs['all']:
+            raise serializers.ValidationError('Pass "ids" or "all": true.')
+        return attrs
+
+    def get_queryset(self):
+        if self.validated_data['all']:
+            return Book.objects.all()
+        return Book.objects.filter(pk__in=self.validated_data['ids'])
+
+
+class BulkPriceSerializer(BulkSelectionSerializer):
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    discount_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=0, required=False
+    )
+    discount_percent = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=0, max_value=100, required=False
+    )
+    clear_discount = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        discounts = [
+            name for name in ('discount_price', 'discount_percent') if attrs.get(name) is not None
+        ] + (['clear_discount'] if attrs['clear_discount'] else [])
+        if len(discounts) > 1:
+            raise serializers.ValidationError(f'Use only one of: {", ".join(discounts)}.')
+        if attrs.get('price') is None and not discounts:
+            raise serializers.ValidationError('Nothing to update.')
+        return attrs
+
+
+class BulkPriceItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    discount_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=0, required=False, allow_null=True
+    )
+
+
+class BulkPublishSerializer(BulkSelectionSerializer):
+    is_published = serializers.BooleanField()
+
+
+class BulkTagSerializer(BulkSelectionSerializer):
+    add = serializers.PrimaryKeyRelatedField(many=True, queryset=Tag.objects.all(), required=False)
+    remove = serializers.PrimaryKeyRelatedField(many=True, queryset=Tag.objects.all(), required=False)
+    replace = serializers.PrimaryKeyRelatedField(many=True, queryset=Tag.objects.all(), required=False)
 
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if 'replace' in attrs and (attrs.get('add') or attrs.get('remove')):
+            raise serializers.ValidationError('"replace" cannot be combined with "add"/"remove".')
+        if not any(name in attrs for name in ('add', 'remove', 'replace')):
+            raise serializers.ValidationError('Nothing to update.')
+        return attrs
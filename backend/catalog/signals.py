@@ -0,0 +1,145 @@
+# backend/catalog/signals.py
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from core.cache import bump_cache_version
+from core.images import build_thumbnails, thumbnails_are_current
+from .models import Author, Category, Tag, Book
+from .search import update_search_index, remove_from_search_index
+from .autocomplete import autocomplete_index
+
+
+# ---- category tree ----
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    # SET_NULL turned the children into roots; refresh their subtrees
+    if instance.path:
+        subtree = Category.objects.filter(path__startswith=instance.path).order_by('depth')
+        Category.rebuild_tree_fields(list(subtree))
+
+
+# ---- full-text search documents ----
+
+def reindex_on_commit(book_ids):
+    # after commit, so relations saved after the book itself (BookAdmin's
+    # inlines) are part of the document
+    book_ids = list(book_ids)
+    transaction.on_commit(lambda: update_search_index(book_ids))
+
+
+@receiver(post_save, sender=Book)
+def book_saved(sender, instance, **kwargs):
+    reindex_on_commit([instance.pk])
+
+
+@receiver(post_delete, sender=Book)
+def book_deleted(sender, instance, **kwargs):
+    remove_from_search_index([instance.pk])
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+@receiver(m2m_changed, sender=Book.tags.through)
+def book_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # author.books.clear(): remember which books lose the name
+        instance._search_book_ids = list(instance.books.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        book_ids = [instance.pk]
+    elif action == 'post_clear':
+        book_ids = getattr(instance, '_search_book_ids', [])
+    else:
+        book_ids = pk_set
+    reindex_on_commit(book_ids)
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Tag)
+def name_source_saved(sender, instance, created, **kwargs):
+    if not created:
+        reindex_on_commit(instance.books.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Author)
+@receiver(pre_delete, sender=Tag)
+def name_source_deleting(sender, instance, **kwargs):
+    instance._search_book_ids = list(instance.books.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Tag)
+def name_source_deleted(sender, instance, **kwargs):
+    reindex_on_commit(getattr(instance, '_search_book_ids', []))
+
+
+# ---- autocomplete index ----
+
+@receiver(post_save, sender=Book)
+def autocomplete_book_saved(sender, instance, **kwargs):
+    autocomplete_index.refresh_books([instance.pk])
+
+
+@receiver(post_delete, sender=Book)
+def autocomplete_book_deleted(sender, instance, **kwargs):
+    autocomplete_index.remove_books([instance.pk])
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+def autocomplete_authors_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        autocomplete_index.refresh_books([instance.pk])
+    elif action == 'post_clear':
+        autocomplete_index.refresh_books(getattr(instance, '_search_book_ids', []))
+    else:
+        autocomplete_index.refresh_books(pk_set)
+
+
+@receiver(post_save, sender=Author)
+def autocomplete_author_saved(sender, instance, created, **kwargs):
+    if not created:
+        autocomplete_index.refresh_books(instance.books.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Author)
+def autocomplete_author_deleted(sender, instance, **kwargs):
+    autocomplete_index.refresh_books(getattr(instance, '_search_book_ids', []))
+
+
+# ---- cover thumbnails ----
+
+@receiver(post_save, sender=Book)
+def cover_image_saved(sender, instance, raw=False, **kwargs):
+    if raw or thumbnails_are_current(instance.cover_image, instance.cover_image_thumbnails):
+        return
+    instance.cover_image_thumbnails = build_thumbnails(instance.cover_image)
+    Book.objects.filter(pk=instance.pk).update(cover_image_thumbnails=instance.cover_image_thumbnails)
+
+
+# ---- response cache ----
+
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+def catalog_changed(sender, **kwargs):
+    bump_cache_version('catalog')
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+@receiver(m2m_changed, sender=Book.categories.through)
+@receiver(m2m_changed, sender=Book.tags.through)
+def catalog_relations_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_cache_version('catalog')
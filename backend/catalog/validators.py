@@ -2,9 +2,25 @@
 
 from django.core.exceptions import ValidationError
 
+from .files import file_digest
+
 ALLOWED_EXTENSIONS = ('.pdf', '.epub')
 MAX_FILE_SIZE_MB = 50
 
+# list-level actions of BookViewSet (/api/books/<name>/): a book with one
+# of these slugs could never be retrieved by its detail URL
+RESERVED_BOOK_SLUGS = frozenset({'autocomplete', 'batch', 'facets'})
+
+
+def validate_book_slug(value):
+    if value in RESERVED_BOOK_SLUGS:
+        raise ValidationError(f'"{value}" is a reserved slug.')
+
+
+def unreserved_book_slug(slug):
+    # for slugs derived from a title, e.g. a book called "Facets"
+    return f'{slug}-book' if slug in RESERVED_BOOK_SLUGS else slug
+
 
 def validate_ebook_file_extension(value):
     name = value.name.lower()
@@ -15,7 +31,12 @@ def validate_ebook_file_extension(value):
 
 
 def validate_ebook_file_size(value):
-    filesize = value.size
+    if getattr(value, '_committed', False):
+        filesize = value.size
+    else:
+        # one streaming pass gives the size and the SHA-256 the field
+        # stores the upload under (memoized on the file)
+        _, filesize = file_digest(value)
     max_bytes = MAX_FILE_SIZE_MB * 1024 * 1024
 
     if filesize > max_bytes:
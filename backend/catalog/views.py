@@ -1,18 +1,38 @@
 # backend/catalog/views.py
-from .filters import BookFilter
-from rest_framework import viewsets, permissions
-from rest_framework.filters import SearchFilter, OrderingFilter
+from .filters import BookFilter, BookOrderingFilter
+from .search import BookSearchFilter
+from .autocomplete import autocomplete_index
+from .facets import compute_facets
+from core.pagination import PageOrCursorPagination
+from core.cache import CachedReadMixin, response_cache_key
+from core.conditional import ConditionalGetMixin
+from core.serializers import parse_fields_param
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .models import Author, Category, Tag, Book
+from .models import Author, Category, Tag, Book, RelatedBook
 from .serializers import (
     AuthorSerializer,
     CategorySerializer,
     TagSerializer,
+    BookCardSerializer,
     BookListSerializer,
     BookDetailSerializer,
     AdminBookSerializer,
+    BulkPriceSerializer,
+    BulkPriceItemSerializer,
+    BulkPublishSerializer,
+    BulkTagSerializer,
 )
+from . import bulk
+
+
+# query parameters that don't change facet counts
+FACET_IGNORED_PARAMS = ("page", "page_size", "cursor", "pagination", "ordering", "fields")
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
@@ -22,64 +42,256 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         return bool(request.user and request.user.is_staff)
 
 
-class AuthorViewSet(viewsets.ModelViewSet):
+class AuthorViewSet(ConditionalGetMixin, CachedReadMixin, viewsets.ModelViewSet):
     queryset = Author.objects.all()
     serializer_class = AuthorSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cache_namespaces = ("catalog",)
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
-    queryset = Category.objects.all()
+class CategoryViewSet(ConditionalGetMixin, CachedReadMixin, viewsets.ModelViewSet):
+    queryset = Category.objects.select_related("parent")
     serializer_class = CategorySerializer
     permission_classes = [IsAdminOrReadOnly]
+    cache_namespaces = ("catalog",)
 
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(ConditionalGetMixin, CachedReadMixin, viewsets.ModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cache_namespaces = ("catalog",)
 
 
-class BookViewSet(viewsets.ReadOnlyModelViewSet):
+class BookViewSet(ConditionalGetMixin, CachedReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     GET /api/books/
     GET /api/books/<slug>/
+    GET /api/books/autocomplete/?q=har
+    GET /api/books/facets/?<same filters as the list>
+    GET /api/books/<slug>/related/
+    GET /api/books/batch/?slugs=a,b,c  (or ?ids=3,1,2)
 
     Supports:
-      - search: ?search=python
+      - search: ?search=python  (full-text, ranked by relevance)
       - filter by category: ?category=programming
       - filter by tag: ?tag=django
       - filter by language: ?language=Bangla
       - file format: ?file_format=pdf
       - price range: ?min_price=100&max_price=500
-      - ordering: ?ordering=price or -price
+      - ordering: ?ordering=price or -price (price after discount),
+                  ?ordering=list_price (undiscounted price)
+      - rating: ?ordering=-rating_avg / -rating_count
+      - bestsellers / trending: ?ordering=-sales_7d / -trending_score
+      - keyset pagination: ?pagination=cursor (newest first, then follow `next`)
+      - compact cards: ?view=card
+      - sparse fieldsets: ?fields=id,title,slug,effective_price
     """
 
-    queryset = Book.objects.filter(is_published=True).prefetch_related(
-        "authors", "categories", "tags"
-    )
+    queryset = Book.objects.filter(is_published=True).for_listing()
     permission_classes = [permissions.AllowAny]
+    pagination_class = PageOrCursorPagination
+    cache_namespaces = ("catalog",)
 
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, BookSearchFilter, BookOrderingFilter]
     filterset_class = BookFilter
-    search_fields = ["title", "description", "authors__name", "tags__name"]
-    ordering_fields = ["price", "discount_price", "created_at"]
+    ordering_fields = [
+        "price", "list_price", "discount_price", "effective_price", "created_at", "rating_avg",
+        "rating_count", "sales_7d", "trending_score",
+    ]
     lookup_field = "slug"
+    BATCH_MAX_ITEMS = 100
+
+    def _wants_card(self):
+        return self.action == "list" and self.request.query_params.get("view") == "card"
+
+    def get_queryset(self):
+        if self._wants_card():
+            return Book.objects.filter(is_published=True).for_card()
+        return super().get_queryset()
 
     def get_serializer_class(self):
         if self.action == "retrieve":
             return BookDetailSerializer
+        if self._wants_card():
+            return BookCardSerializer
         return BookListSerializer
 
+    def get_serializer(self, *args, **kwargs):
+        fields = parse_fields_param(self.request)
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
+
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def autocomplete(self, request):
+        """
+        Search-box suggestions from the in-memory index (no DB queries).
+        ?q=<text>&limit=8 (max 20)
+        """
+        try:
+            limit = min(max(int(request.query_params.get("limit", 8)), 1), 20)
+        except ValueError:
+            limit = 8
+
+        entries = autocomplete_index.search(request.query_params.get("q", ""), limit=limit)
+        return Response([
+            {
+                "id": entry.id,
+                "slug": entry.slug,
+                "title": entry.title,
+                "cover_image": request.build_absolute_uri(entry.cover) if entry.cover else None,
+            }
+            for entry in entries
+        ])
+
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def facets(self, request):
+        """
+        Sidebar counts (category, tag, language, file_format, price bucket)
+        for the books matching the current filters/search, in one request.
+        Cached per filter signature until the catalog changes.
+        """
+        key = "facets:" + response_cache_key(
+            request, self.cache_namespaces, ignore_params=FACET_IGNORED_PARAMS
+        )
+        data = cache.get(key)
+        if data is None:
+            data = compute_facets(self.filter_queryset(self.get_queryset()))
+            cache.set(key, data, self.cache_timeout)
+        return Response(data)
+
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def batch(self, request):
+        """
+        Cards for many books in one request, in the requested order.
+        Unknown/unpublished keys come back as {"slug": ..., "not_found": true}
+        (or "id"). At most BATCH_MAX_ITEMS keys; ?fields= works as on the list.
+        """
+        if "ids" in request.query_params:
+            key = "id"
+            keys = [k.strip() for k in request.query_params["ids"].split(",") if k.strip()]
+            keys = [int(k) if k.isdigit() else k for k in keys]
+        else:
+            key = "slug"
+            keys = [k.strip() for k in request.query_params.get("slugs", "").split(",") if k.strip()]
+
+        if len(keys) > self.BATCH_MAX_ITEMS:
+            return Response(
+                {"detail": f"At most {self.BATCH_MAX_ITEMS} books per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        lookup = [k for k in keys if key == "slug" or isinstance(k, int)]
+        books = {
+            getattr(book, key): book
+            for book in Book.objects.filter(is_published=True, **{f"{key}__in": lookup}).for_card()
+        }
+        serializer = BookCardSerializer(
+            [books[k] for k in keys if k in books],
+            many=True,
+            context=self.get_serializer_context(),
+            fields=parse_fields_param(request),
+        )
+        found = iter(serializer.data)
+        return Response({
+            "results": [
+                next(found) if k in books else {key: k, "not_found": True}
+                for k in keys
+            ]
+        })
+
+    @action(detail=True, methods=["get"], pagination_class=None)
+    def related(self, request, slug=None):
+        """
+        "Customers also bought" cards, best first, from the table built by
+        `manage.py build_related_books`. Cached until the next rebuild or
+        catalog change.
+        """
+        # the cards hold absolute URLs, so the key includes the host
+        key = "related:" + response_cache_key(request, ("catalog", "related"))
+        data = cache.get(key)
+        if data is None:
+            book_id = get_object_or_404(
+                Book.objects.filter(is_published=True).values_list("pk", flat=True), slug=slug
+            )
+            related_ids = list(
+                RelatedBook.objects.filter(book_id=book_id, related__is_published=True)
+                .order_by("rank")
+                .values_list("related_id", flat=True)
+            )
+            books = Book.objects.filter(pk__in=related_ids).for_card().in_bulk()
+            data = BookCardSerializer(
+                [books[pk] for pk in related_ids if pk in books],
+                many=True,
+                context=self.get_serializer_context(),
+            ).data
+            cache.set(key, data, self.cache_timeout)
+        return Response(data)
+
 
 class AdminBookViewSet(viewsets.ModelViewSet):
     """
     CRUD for Books (Admin only)
+
+    Bulk edits, each a single transaction:
+    POST /api/admin/books/bulk/price/    {"ids": [...] | "all": true, "price"?, one of
+                                          "discount_price" / "discount_percent" / "clear_discount"}
+                                         or {"items": [{"id", "price"?, "discount_price"?}, ...]}
+    POST /api/admin/books/bulk/publish/  {"ids" | "all", "is_published": true}
+    POST /api/admin/books/bulk/tags/     {"ids" | "all", "add": [tag ids], "remove": [...]}
+                                         or "replace": [...]
     """
-    queryset = Book.objects.all().order_by("-created_at")
+    queryset = (
+        Book.objects.all()
+        .prefetch_related("authors", "categories", "tags")
+        .order_by("-created_at")
+    )
     serializer_class = AdminBookSerializer
     permission_classes = [permissions.IsAdminUser]
 
+    @action(detail=False, methods=["post"], url_path="bulk/price")
+    def bulk_price(self, request):
+        if "items" in request.data:
+            serializer = BulkPriceItemSerializer(data=request.data["items"], many=True)
+            serializer.is_valid(raise_exception=True)
+            return Response({"updated": bulk.bulk_update_items(serializer.validated_data)})
+
+        serializer = BulkPriceSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        updated = bulk.bulk_update_prices(
+            serializer.get_queryset(),
+            price=data.get("price"),
+            discount_price=data.get("discount_price"),
+            discount_percent=data.get("discount_percent"),
+            clear_discount=data["clear_discount"],
+        )
+        return Response({"updated": updated})
+
+    @action(detail=False, methods=["post"], url_path="bulk/publish")
+    def bulk_publish(self, request):
+        serializer = BulkPublishSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = bulk.bulk_set_published(
+            serializer.get_queryset(), serializer.validated_data["is_published"]
+        )
+        return Response({"updated": updated})
+
+    @action(detail=False, methods=["post"], url_path="bulk/tags")
+    def bulk_tags(self, request):
+        serializer = BulkTagSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        replace = data.get("replace")
+        updated = bulk.bulk_assign_tags(
+            serializer.get_queryset(),
+            add=[tag.pk for tag in data.get("add", [])],
+            remove=[tag.pk for tag in data.get("remove", [])],
+            replace=[tag.pk for tag in replace] if replace is not None else None,
+        )
+        return Response({"updated": updated})
+
     def destroy(self, request, *args, **kwargs):
         from django.db.models import ProtectedError
         from rest_framework.response import Response
@@ -2,6 +2,7 @@ from datetime import timedelta
 from pathlib import Path
 import os
 import environ
+from corsheaders.defaults import default_headers as default_cors_headers
 
 # ============================
 # Base Directory
@@ -74,6 +75,7 @@ MIDDLEWARE = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = (*default_cors_headers, "idempotency-key", "x-cart-session")
 
 # ============================
 # URLs & Templates
@@ -116,6 +118,38 @@ else:
         }
     }
 
+# ============================
+# Cache
+# ============================
+# Redis in production, per-process memory locally and in tests
+REDIS_URL = env("REDIS_URL", default="")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# public storefront origin used for links in sitemaps and the product feed
+# (defaults to the API host)
+FRONTEND_URL = env("FRONTEND_URL", default="")
+
+# how long a stored Idempotency-Key response is replayed (core.idempotency)
+IDEMPOTENCY_KEY_TTL = timedelta(hours=env.int("IDEMPOTENCY_KEY_TTL_HOURS", default=24))
+# an unanswered key older than this is treated as abandoned and may be retried
+IDEMPOTENCY_KEY_LEASE = timedelta(minutes=env.int("IDEMPOTENCY_KEY_LEASE_MINUTES", default=2))
+
+# seconds an anonymous catalog/blog response may be served from cache
+# (model changes invalidate earlier via core.cache.bump_cache_version)
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=600)
+
 # ============================
 # Django REST Framework
 # ============================
@@ -131,6 +165,15 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'EXCEPTION_HANDLER': 'core.exceptions.custom_exception_handler',
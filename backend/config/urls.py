@@ -20,6 +20,9 @@ urlpatterns = [
     path("api/contact/", include("contact.urls")),
     path("api/", include("core.urls")),
     path("api/debug-settings/", include("core.debug_urls")),
+
+    # sitemaps & product feed (streamed, disk-cached)
+    path("", include("core.feed_urls")),
 ]
 
 # Serve media files in development
@@ -0,0 +1,127 @@
+# backend/core/cache.py
+
+import hashlib
+import json
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+
+
+VERSION_KEY = 'cache-version:%s'
+
+
+def _initial_version():
+    # a missing (never set or evicted) version starts from the clock, so
+    # it can't fall back to a number older entries were cached under
+    return time.time_ns() // 1000
+
+
+def get_cache_version(*namespaces):
+    """
+    Current generation number of each namespace, e.g. {'catalog': 7}.
+    """
+    keys = {VERSION_KEY % ns: ns for ns in namespaces}
+    found = cache.get_many(keys.keys())
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, _initial_version(), None)
+        found.update(cache.get_many(missing))
+    return {ns: found[key] for key, ns in keys.items()}
+
+
+def _bump(namespaces):
+    for ns in namespaces:
+        key = VERSION_KEY % ns
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _initial_version(), None)
+
+
+def bump_cache_version(*namespaces):
+    """
+    Start a new generation: every response cached under the old
+    version number simply stops being looked up and expires on its own.
+
+    Runs once the current transaction commits (immediately outside one),
+    so a concurrent reader can't cache pre-commit rows under the new
+    generation.
+    """
+    transaction.on_commit(lambda: _bump(namespaces))
+
+
+def response_cache_key(request, namespaces, ignore_params=()):
+    """
+    `ignore_params`: query parameters that don't affect the response
+    (e.g. paging for an endpoint that isn't paged).
+    """
+    versions = get_cache_version(*namespaces)
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+        if value != '' and name not in ignore_params
+    )
+    raw = '|'.join([
+        request.get_host(),
+        request.path,
+        urlencode(params),
+        ','.join(f'{ns}={versions[ns]}' for ns in namespaces),
+    ])
+    return 'response:' + hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def content_etag(data):
+    """
+    Strong ETag for serialized response data.
+    """
+    raw = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder, default=str)
+    return quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+
+class CachedReadMixin:
+    """
+    Cache list/retrieve responses for anonymous GETs.
+
+    Keys contain the normalized query string and the generation of each
+    namespace in `cache_namespaces`; signal handlers call
+    bump_cache_version() when the underlying models change. The content
+    ETag is stored with the data, so hits are answered (and validated by
+    core.conditional) without touching the database.
+    """
+    cache_namespaces = ()
+    cache_timeout = settings.RESPONSE_CACHE_TIMEOUT
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(super().retrieve, request, *args, **kwargs)
+
+    def _cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated or not self.cache_namespaces:
+            return handler(request, *args, **kwargs)
+
+        key = response_cache_key(request, self.cache_namespaces)
+        cached = cache.get(key)
+        if cached is not None:
+            data, etag = cached
+            response = Response(data)
+            response['ETag'] = etag
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            etag = content_etag(response.data)
+            cache.set(key, (response.data, etag), self.cache_timeout)
+            response['ETag'] = etag
+            response['X-Cache'] = 'MISS'
+        return response
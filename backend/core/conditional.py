@@ -0,0 +1,76 @@
+# backend/core/conditional.py
+
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import content_etag, get_cache_version
+
+
+class ConditionalGetMixin:
+    """
+    ETag support for list and retrieve.
+
+      - list: a content ETag of the page. CachedReadMixin stores it with
+        the cached payload, so it is only computed on a cache miss (or
+        for uncached, authenticated requests).
+      - retrieve: updated_at of the object (one cheap query before
+        anything is serialized) plus the view's cache namespace
+        generations (core.cache), so changes that don't touch updated_at
+        (ratings, M2M edits, author renames) still change the ETag.
+    No Last-Modified on either: those changes (and deletes/unpublishes on
+    lists) don't move updated_at, so If-Modified-Since would give false
+    304s. A matching If-None-Match gets a bodyless 304.
+    """
+    last_modified_field = 'updated_at'
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+        etag = response.get('ETag') or content_etag(response.data)
+        conditional = get_conditional_response(request, etag=etag)
+        if conditional is not None:
+            response = Response(status=conditional.status_code)
+        response['ETag'] = etag
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        last_modified = (
+            self.get_queryset()
+            .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+            .values_list(self.last_modified_field, flat=True)
+            .first()
+        )
+        if last_modified is None:
+            # let the normal path raise the 404
+            return super().retrieve(request, *args, **kwargs)
+        return self._conditional_response(
+            super().retrieve, last_modified, 1, request, *args, **kwargs
+        )
+
+    def _conditional_response(self, handler, last_modified, count, request, *args, **kwargs):
+        versions = get_cache_version(*getattr(self, 'cache_namespaces', ()))
+        raw = '|'.join([
+            last_modified.isoformat() if last_modified else '-',
+            str(count),
+            ','.join(f'{ns}={version}' for ns, version in sorted(versions.items())),
+        ])
+        etag = quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+        conditional = get_conditional_response(request, etag=etag)
+        if conditional is not None:
+            # 304, or 412 for a failed If-Match
+            response = Response(status=conditional.status_code)
+        else:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+        response['ETag'] = etag
+        return response
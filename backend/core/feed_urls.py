@@ -0,0 +1,9 @@
+from django.urls import path, re_path
+
+from .feed_views import product_feed, sitemap_index, sitemap_section
+
+urlpatterns = [
+    path("sitemap.xml", sitemap_index, name="sitemap-index"),
+    path("sitemap-<slug:section>-<int:number>.xml", sitemap_section, name="sitemap-section"),
+    re_path(r"^feeds/products\.(?P<fmt>csv|xml)$", product_feed, name="product-feed"),
+]
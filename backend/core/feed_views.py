@@ -0,0 +1,105 @@
+# backend/core/feed_views.py
+
+import os
+
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
+
+from . import feeds
+
+
+def _serve(request, name, validators, namespaces, chunks, content_type):
+    """
+    304 when the client is current, else the cached file when there is
+    one, else stream `chunks` (a generator) while caching it to disk.
+
+    No Last-Modified: MAX(updated_at) of the remaining rows doesn't move
+    when a row is deleted or unpublished, so only the ETag (which also
+    covers the cache generation of `namespaces`) is a safe validator.
+    """
+    key = feeds.document_key(request, validators, namespaces)
+    etag = quote_etag(key)
+
+    conditional = get_conditional_response(request, etag=etag)
+    if conditional is not None:
+        return conditional
+
+    path = feeds.cache_path(name, key)
+    if os.path.exists(path):
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    else:
+        response = StreamingHttpResponse(feeds.stream_to_cache(chunks, path), content_type=content_type)
+
+    response['ETag'] = etag
+    return response
+
+
+def _sitemap_url(section, number):
+    return reverse('sitemap-section', kwargs={'section': section, 'number': number})
+
+
+@require_safe
+def sitemap_index(request):
+    """
+    GET /sitemap.xml -> index of the chunked book/post sitemaps
+    """
+    lastmods, count = [], 0
+    for section in feeds.SECTIONS.values():
+        section_lastmod, section_count = feeds.validators(section.rows())
+        if section_lastmod:
+            lastmods.append(section_lastmod)
+        count += section_count
+
+    return _serve(
+        request,
+        'sitemap-index',
+        (max(lastmods, default=None), count),
+        [section.namespace for section in feeds.SECTIONS.values()],
+        feeds.sitemap_index(request, _sitemap_url),
+        'application/xml',
+    )
+
+
+@require_safe
+def sitemap_section(request, section, number):
+    """
+    GET /sitemap-<books|posts>-<n>.xml
+    """
+    if section not in feeds.SECTIONS:
+        raise Http404
+    section = feeds.SECTIONS[section]
+    validators = feeds.validators(section.chunk(number))
+    if not validators[1]:
+        raise Http404
+
+    return _serve(
+        request,
+        f'sitemap-{section.name}-{number}',
+        validators,
+        [section.namespace],
+        feeds.sitemap_chunk(request, section, number),
+        'application/xml',
+    )
+
+
+@require_safe
+def product_feed(request, fmt):
+    """
+    GET /feeds/products.csv | /feeds/products.xml (Google Merchant style)
+    """
+    generator, content_type = {
+        'csv': (feeds.product_feed_csv, 'text/csv; charset=utf-8'),
+        'xml': (feeds.product_feed_xml, 'application/xml'),
+    }[fmt]
+
+    return _serve(
+        request,
+        f'products-{fmt}',
+        feeds.validators(feeds.SECTIONS['books'].rows()),
+        [feeds.SECTIONS['books'].namespace],
+        generator(request),
+        content_type,
+    )
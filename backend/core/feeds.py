@@ -0,0 +1,244 @@
+# backend/core/feeds.py
+"""
+Sitemaps and the product feed, streamed row by row.
+
+Every document is produced by a generator over `.iterator(chunk_size=...)`
+querysets, so memory stays flat however big the catalog is. While the
+first request streams a document it is also written to FEED_CACHE_DIR;
+later requests are served from that file until the underlying rows
+change. The file name, also sent as the ETag, is a digest of
+MAX(updated_at) and COUNT(*) of the rows plus the response cache
+generation of their models, which also moves when a row is deleted or
+unpublished and when a related row (e.g. an author) is renamed.
+
+Sitemaps are split by primary key range: sitemap chunk N of a section
+holds the rows with pk in [N * SITEMAP_CHUNK_SIZE, (N + 1) * SITEMAP_CHUNK_SIZE),
+so each chunk stays under the 50k URL limit and the index is a single
+GROUP BY.
+"""
+
+import csv
+import hashlib
+import io
+import os
+import tempfile
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, F, Max
+
+from blog.models import Post
+from catalog.models import Book
+from .cache import get_cache_version
+
+
+SITEMAP_CHUNK_SIZE = 10000
+ITERATOR_CHUNK_SIZE = 2000
+FEED_CACHE_DIR = getattr(
+    settings, 'FEED_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'oneheart-feeds')
+)
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+GOOGLE_NS = 'http://base.google.com/ns/1.0'
+
+FEED_FIELDS = [
+    'id', 'title', 'description', 'link', 'image_link', 'price', 'sale_price',
+    'availability', 'brand', 'language', 'file_format',
+]
+
+
+def frontend_url(request, path):
+    base = getattr(settings, 'FRONTEND_URL', '') or request.build_absolute_uri('/')
+    return base.rstrip('/') + path
+
+
+def _lastmod(value):
+    return value.strftime('%Y-%m-%dT%H:%M:%S+00:00') if value else ''
+
+
+# ---- sections ----
+
+class Section:
+    """
+    A sitemap section: published rows of one model, their public URL and
+    the cache namespace bumped when they change.
+    """
+
+    def __init__(self, name, queryset, path, namespace):
+        self.name = name
+        self.queryset = queryset
+        self.path = path  # e.g. '/books/{slug}'
+        self.namespace = namespace
+
+    def rows(self):
+        return self.queryset()
+
+    def chunk(self, number):
+        low = number * SITEMAP_CHUNK_SIZE
+        return self.rows().filter(pk__gte=low, pk__lt=low + SITEMAP_CHUNK_SIZE)
+
+    def chunks(self):
+        """
+        [(chunk number, last modified)] of the non-empty chunks.
+        """
+        return list(
+            self.rows()
+            .annotate(chunk=F('pk') / SITEMAP_CHUNK_SIZE)
+            .values('chunk')
+            .annotate(lastmod=Max('updated_at'))
+            .order_by('chunk')
+            .values_list('chunk', 'lastmod')
+        )
+
+
+SECTIONS = {
+    'books': Section(
+        'books', lambda: Book.objects.filter(is_published=True), '/books/{slug}', 'catalog',
+    ),
+    'posts': Section(
+        'posts', lambda: Post.objects.filter(is_published=True), '/blog/{pk}', 'blog',
+    ),
+}
+
+
+def validators(queryset):
+    """
+    (last modified, row count) of a queryset, the cache validators.
+    """
+    stats = queryset.order_by().aggregate(lastmod=Max('updated_at'), count=Count('pk'))
+    return stats['lastmod'], stats['count']
+
+
+# ---- generators ----
+
+def sitemap_index(request, sitemap_url):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<sitemapindex xmlns="{SITEMAP_NS}">\n'
+    for section in SECTIONS.values():
+        for number, lastmod in section.chunks():
+            loc = escape(request.build_absolute_uri(sitemap_url(section.name, number)))
+            yield f'<sitemap><loc>{loc}</loc><lastmod>{_lastmod(lastmod)}</lastmod></sitemap>\n'
+    yield '</sitemapindex>\n'
+
+
+def sitemap_chunk(request, section, number):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<urlset xmlns="{SITEMAP_NS}">\n'
+    rows = section.chunk(number).order_by('pk').values('pk', 'slug', 'updated_at')
+    for row in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        loc = escape(frontend_url(request, section.path.format(**row)))
+        yield f'<url><loc>{loc}</loc><lastmod>{_lastmod(row["updated_at"])}</lastmod></url>\n'
+    yield '</urlset>\n'
+
+
+def _feed_books():
+    return (
+        Book.objects.filter(is_published=True)
+        .only(
+            'pk', 'slug', 'title', 'description', 'cover_image', 'price',
+            'effective_price', 'currency', 'language', 'file_format',
+        )
+        .prefetch_related('authors')
+        .order_by('pk')
+        .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+
+
+def _feed_item(request, book):
+    sale = book.effective_price if book.effective_price != book.price else None
+    return {
+        'id': book.pk,
+        'title': book.title,
+        'description': ' '.join(book.description.split())[:5000],
+        'link': frontend_url(request, f'/books/{book.slug}'),
+        'image_link': request.build_absolute_uri(book.cover_image.url) if book.cover_image else '',
+        'price': f'{book.price} {book.currency}',
+        'sale_price': f'{sale} {book.currency}' if sale is not None else '',
+        'availability': 'in stock',
+        'brand': ', '.join(author.name for author in book.authors.all()),
+        'language': book.language,
+        'file_format': book.file_format,
+    }
+
+
+def product_feed_csv(request):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FEED_FIELDS)
+
+    def flush():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writeheader()
+    yield flush()
+    for book in _feed_books():
+        writer.writerow(_feed_item(request, book))
+        yield flush()
+
+
+def product_feed_xml(request):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<rss version="2.0" xmlns:g="{GOOGLE_NS}"><channel>\n'
+    yield f'<title>Books</title><link>{escape(frontend_url(request, "/books"))}</link>\n'
+    for book in _feed_books():
+        item = _feed_item(request, book)
+        tags = ''.join(
+            f'<g:{name}>{escape(str(value))}</g:{name}>'
+            for name, value in item.items()
+            if value != ''
+        )
+        yield f'<item>{tags}</item>\n'
+    yield '</channel></rss>\n'
+
+
+# ---- disk cache ----
+
+def document_key(request, validators, namespaces):
+    """
+    Digest of one version of a document, used as its file name and ETag.
+    """
+    lastmod, count = validators
+    versions = get_cache_version(*namespaces)
+    # documents contain absolute URLs, so the host is part of the key
+    raw = '|'.join([
+        request.get_host(),
+        lastmod.isoformat() if lastmod else '',
+        str(count),
+        ','.join(f'{ns}={versions[ns]}' for ns in namespaces),
+    ])
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def cache_path(name, key):
+    return os.path.join(FEED_CACHE_DIR, f'{name}.{key}')
+
+
+def stream_to_cache(chunks, path):
+    """
+    Yield `chunks` (str) as bytes while writing them to `path`; the file
+    only appears once the whole document was produced. Older versions of
+    the same document are removed.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    prefix = os.path.basename(path).rsplit('.', 1)[0] + '.'
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    completed = False
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for chunk in chunks:
+                data = chunk.encode('utf-8')
+                out.write(data)
+                yield data
+        os.replace(tmp, path)
+        completed = True
+        for entry in os.listdir(os.path.dirname(path)):
+            if entry.startswith(prefix) and entry != os.path.basename(path):
+                try:
+                    os.remove(os.path.join(os.path.dirname(path), entry))
+                except OSError:
+                    pass
+    finally:
+        if not completed and os.path.exists(tmp):
+            os.remove(tmp)
@@ -0,0 +1,140 @@
+# backend/core/idempotency.py
+"""
+Idempotency-Key support for POST endpoints that must not run twice
+(checkout, manual payment submission).
+
+    @idempotent
+    def post(self, request, ...): ...
+
+A request carrying an `Idempotency-Key` header claims the key for its user
+(one INSERT; the unique constraint settles races) and, once the view has
+answered, the status code and response data are stored with it. A retry
+with the same key and the same request gets the stored response back
+without the view running again:
+
+  - same key, different method/path/body -> 422
+  - same key while the first request is still running -> 409
+  - view raised or answered 5xx -> key released, so the client may retry
+
+The view and the write of its stored response run in one transaction,
+so they commit (or roll back) together. A key still "in progress" after
+IDEMPOTENCY_KEY_LEASE (longer than any request may run) belongs to a
+process that died before answering; the next retry takes it over.
+
+Requests without the header behave as before.
+"""
+
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(request):
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    payload = json.dumps(
+        [request.method, request.path, data], sort_keys=True, cls=DjangoJSONEncoder, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _claim(user, key, fingerprint):
+    """
+    -> (record, created). Expired records are replaced.
+    """
+    now = timezone.now()
+    expires_at = now + settings.IDEMPOTENCY_KEY_TTL
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(
+                user=user, key=key, fingerprint=fingerprint, expires_at=expires_at
+            ), True
+    except IntegrityError:
+        pass
+
+    record = IdempotencyKey.objects.filter(user=user, key=key).first()
+    if record is None or record.expires_at <= now:
+        IdempotencyKey.objects.filter(user=user, key=key, expires_at__lte=now).delete()
+        return _claim(user, key, fingerprint)
+
+    if (
+        record.status_code is None
+        and record.fingerprint == fingerprint
+        and record.created_at <= now - settings.IDEMPOTENCY_KEY_LEASE
+    ):
+        # abandoned: the compare-and-set makes sure only one retry wins
+        taken = IdempotencyKey.objects.filter(
+            pk=record.pk, status_code__isnull=True, created_at=record.created_at
+        ).update(created_at=now, expires_at=expires_at)
+        if taken:
+            record.created_at, record.expires_at = now, expires_at
+            return record, True
+    return record, False
+
+
+def _replay(record):
+    response = Response(record.response_body, status=record.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view_method):
+    """
+    Decorator for APIView handler methods; see the module docstring.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER, '').strip()
+        if not key or not request.user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'detail': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fingerprint = request_fingerprint(request)
+        record, created = _claim(request.user, key, fingerprint)
+        if not created:
+            if record.fingerprint != fingerprint:
+                return Response(
+                    {'detail': f'{HEADER} was already used for a different request.'},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            if record.status_code is None:
+                return Response(
+                    {'detail': f'A request with this {HEADER} is still being processed.'},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            return _replay(record)
+
+        try:
+            with transaction.atomic():
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code < 500 and hasattr(response, 'data'):
+                    record.status_code = response.status_code
+                    record.response_body = response.data
+                    record.save(update_fields=['status_code', 'response_body'])
+        except Exception:
+            record.delete()
+            raise
+
+        if record.status_code is None:
+            record.delete()
+        return response
+
+    return wrapper
@@ -0,0 +1,115 @@
+# backend/core/images.py
+"""
+Responsive thumbnails for uploaded images (book covers, blog images).
+
+For each source image we store a few downscaled copies in THUMBNAIL_FORMAT
+under content-hashed names:
+
+    thumbs/<sha256 of the source, 16 chars>-<width>w.webp
+
+so identical uploads share files, a changed image never reuses a stale
+URL, and the derivatives can be cached forever by browsers/CDNs.
+
+The model keeps a small JSON map in a `<field>_thumbnails` field
+(IMAGE_FIELDS lists them):
+
+    {"source": "books/covers/x.jpg", "widths": {"160": "thumbs/…-160w.webp", ...}}
+
+The resizing itself lives in core.thumbnails, which has no Django imports,
+so it can run in a ProcessPoolExecutor under any start method (see the
+generate_thumbnails command).
+"""
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+
+from .thumbnails import render
+
+
+THUMBNAIL_WIDTHS = tuple(getattr(settings, 'THUMBNAIL_WIDTHS', (160, 320, 640)))
+THUMBNAIL_FORMAT = getattr(settings, 'THUMBNAIL_FORMAT', 'WEBP')
+THUMBNAIL_QUALITY = getattr(settings, 'THUMBNAIL_QUALITY', 80)
+THUMBNAIL_DIR = 'thumbs'
+
+EXTENSIONS = {'WEBP': 'webp', 'AVIF': 'avif', 'JPEG': 'jpg'}
+
+# (model, image field, response cache namespace)
+IMAGE_FIELDS = [
+    ('catalog.Book', 'cover_image', 'catalog'),
+    ('blog.Post', 'featured_image', 'blog'),
+]
+
+
+def thumbnail_name(digest, width):
+    return f'{THUMBNAIL_DIR}/{digest[:16]}-{width}w.{EXTENSIONS[THUMBNAIL_FORMAT]}'
+
+
+def render_thumbnails(data):
+    """
+    Bytes of a source image -> (sha256 hex digest, {width: encoded bytes})
+    at the configured widths / format / quality (core.thumbnails.render).
+    """
+    return render(data, THUMBNAIL_WIDTHS, THUMBNAIL_FORMAT, THUMBNAIL_QUALITY)
+
+
+def store_thumbnails(source_name, digest, rendered, storage=default_storage):
+    """
+    Save rendered thumbnails (skipping ones already stored under the same
+    content hash) and return the JSON map for the model field.
+    """
+    widths = {}
+    for width, content in rendered.items():
+        name = thumbnail_name(digest, width)
+        if not storage.exists(name):
+            name = storage.save(name, ContentFile(content))
+        widths[str(width)] = name
+    return {'source': source_name, 'widths': widths}
+
+
+def build_thumbnails(fieldfile):
+    """
+    Read `fieldfile`, render and store its thumbnails; returns the JSON map
+    ({} without an image, no widths when it can't be decoded).
+    """
+    if not fieldfile:
+        return {}
+    try:
+        fieldfile.open('rb')
+        try:
+            data = fieldfile.read()
+        finally:
+            fieldfile.close()
+        digest, rendered = render_thumbnails(data)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        # remember the failure so it isn't retried on every save
+        return {'source': fieldfile.name, 'widths': {}}
+    return store_thumbnails(fieldfile.name, digest, rendered, fieldfile.storage)
+
+
+def thumbnails_are_current(fieldfile, thumbnails):
+    if not fieldfile:
+        return not thumbnails
+    return (thumbnails or {}).get('source') == fieldfile.name
+
+
+def thumbnail_urls(thumbnails, request=None, storage=default_storage):
+    """
+    [(width, absolute url)] from a `<field>_thumbnails` map, narrowest first.
+    """
+    urls = []
+    for width, name in sorted((thumbnails or {}).get('widths', {}).items(), key=lambda i: int(i[0])):
+        url = storage.url(name)
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        urls.append((int(width), url))
+    return urls
+
+
+def srcset(thumbnails, request=None):
+    """
+    "https://…-160w.webp 160w, https://…-320w.webp 320w" (None without thumbnails).
+    """
+    urls = thumbnail_urls(thumbnails, request)
+    return ', '.join(f'{url} {width}w' for width, url in urls) or None
@@ -0,0 +1,88 @@
+import io
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from catalog.models import Book
+from catalog.serializers import BookListSerializer
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+from orders.models import Order
+from orders.serializers import OrderSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's stdlib JSON renderer/parser with the orjson ones on "
+        "/api/books/ and /api/orders/admin/ style payloads built from the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--items",
+            type=int,
+            default=100,
+            help="Rows per payload; existing rows are repeated to reach it (default: 100)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=200,
+            help="Timed iterations per renderer (default: 200)",
+        )
+
+    def _payload(self, serializer_class, queryset, items):
+        rows = serializer_class(queryset[:items], many=True).data
+        if not rows:
+            return None
+        rows = (list(rows) * (items // len(rows) + 1))[:items]
+        return {"count": len(rows), "next": None, "previous": None, "results": rows}
+
+    def _time(self, func, repeat):
+        return min(timeit.repeat(func, number=repeat, repeat=3)) / repeat * 1000
+
+    def handle(self, *args, **options):
+        items = options["items"]
+        repeat = options["repeat"]
+
+        payloads = {
+            "/api/books/": self._payload(
+                BookListSerializer, Book.objects.for_listing(), items
+            ),
+            "/api/orders/admin/": self._payload(
+                OrderSerializer,
+                OrderSerializer.setup_eager_loading(Order.objects.order_by("-created_at")),
+                items,
+            ),
+        }
+        if not any(payloads.values()):
+            raise CommandError("No books or orders in the database to build payloads from.")
+
+        std_renderer, fast_renderer = JSONRenderer(), ORJSONRenderer()
+        std_parser, fast_parser = JSONParser(), ORJSONParser()
+
+        for name, data in payloads.items():
+            if data is None:
+                self.stdout.write(f"{name}: no rows, skipped")
+                continue
+
+            std_bytes = std_renderer.render(data)
+            fast_bytes = fast_renderer.render(data)
+
+            render_std = self._time(lambda: std_renderer.render(data), repeat)
+            render_fast = self._time(lambda: fast_renderer.render(data), repeat)
+            parse_std = self._time(lambda: std_parser.parse(io.BytesIO(std_bytes)), repeat)
+            parse_fast = self._time(lambda: fast_parser.parse(io.BytesIO(std_bytes)), repeat)
+
+            self.stdout.write(
+                f"{name} ({items} rows, {len(std_bytes):,} bytes, "
+                f"identical output: {'yes' if std_bytes == fast_bytes else 'NO'})\n"
+                f"  render: stdlib {render_std:.3f} ms, orjson {render_fast:.3f} ms "
+                f"({render_std / render_fast:.1f}x)\n"
+                f"  parse:  stdlib {parse_std:.3f} ms, orjson {parse_fast:.3f} ms "
+                f"({parse_std / parse_fast:.1f}x)"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete expired Idempotency-Key records."
+
+    def handle(self, *args, **options):
+        num_deleted, _ = IdempotencyKey.objects.filter(expires_at__lt=timezone.now()).delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {num_deleted} expired idempotency keys.")
+        )
@@ -0,0 +1,109 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from core.cache import bump_cache_version
+from core.images import (
+    IMAGE_FIELDS, THUMBNAIL_FORMAT, THUMBNAIL_QUALITY, THUMBNAIL_WIDTHS,
+    store_thumbnails, thumbnails_are_current,
+)
+from core.thumbnails import render_or_none
+
+
+# runs in the worker processes, which import only core.thumbnails
+_render = partial(
+    render_or_none, widths=THUMBNAIL_WIDTHS, fmt=THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY
+)
+
+
+class Command(BaseCommand):
+    help = "Generate responsive thumbnails for book covers and blog images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate thumbnails that are already up to date",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes used for resizing (default: CPU count)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Images read and written per batch (default: 50)",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for label, field_name, namespace in IMAGE_FIELDS:
+                model = apps.get_model(label)
+                done, failed = self.backfill(model, field_name, pool, options)
+                if done:
+                    bump_cache_version(namespace)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{model._meta.verbose_name_plural}: generated thumbnails "
+                        f"for {done} images ({failed} could not be read)."
+                    )
+                )
+
+    def backfill(self, model, field_name, pool, options):
+        thumbs_field = f"{field_name}_thumbnails"
+        queryset = (
+            model.objects.exclude(**{field_name: ""})
+            .exclude(**{f"{field_name}__isnull": True})
+            .only("pk", field_name, thumbs_field)
+            .order_by("pk")
+        )
+
+        done = failed = 0
+        batch = []
+        for obj in queryset.iterator(chunk_size=options["batch_size"]):
+            fieldfile = getattr(obj, field_name)
+            if options["force"] or not thumbnails_are_current(fieldfile, getattr(obj, thumbs_field)):
+                batch.append(obj)
+            if len(batch) >= options["batch_size"]:
+                d, f = self.process_batch(model, field_name, batch, pool)
+                done, failed, batch = done + d, failed + f, []
+        if batch:
+            d, f = self.process_batch(model, field_name, batch, pool)
+            done, failed = done + d, failed + f
+        return done, failed
+
+    def process_batch(self, model, field_name, batch, pool):
+        thumbs_field = f"{field_name}_thumbnails"
+
+        # storage I/O stays in this process; only the resizing is farmed out
+        sources = []
+        for obj in batch:
+            fieldfile = getattr(obj, field_name)
+            try:
+                with fieldfile.open("rb") as f:
+                    sources.append(f.read())
+            except OSError:
+                sources.append(None)
+
+        done = failed = 0
+        results = pool.map(_render, [data or b"" for data in sources])
+        for obj, result in zip(batch, results):
+            fieldfile = getattr(obj, field_name)
+            if result is None:
+                failed += 1
+                thumbnails = {"source": fieldfile.name, "widths": {}}
+            else:
+                done += 1
+                digest, rendered = result
+                thumbnails = store_thumbnails(fieldfile.name, digest, rendered, fieldfile.storage)
+            setattr(obj, thumbs_field, thumbnails)
+
+        model.objects.bulk_update(batch, [thumbs_field])
+        return done, failed
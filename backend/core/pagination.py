@@ -0,0 +1,144 @@
+# backend/core/pagination.py
+
+import base64
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination on a (field, id) pair, e.g. (created_at, id).
+
+    Pages are fetched with WHERE (field, id) < (last_field, last_id) instead
+    of OFFSET, and no COUNT(*) is run, so every page costs O(page size)
+    however deep the client scrolls.
+
+    The view may set `cursor_ordering` (default: newest first by created_at).
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = getattr(view, 'cursor_ordering', self.ordering)
+        self.descending = self.ordering[0].startswith('-')
+        self.field = self.ordering[0].lstrip('-')
+        self.model_field = queryset.model._meta.get_field(self.field)
+
+        position, reverse = self.decode_cursor(request)
+
+        # walking backwards: flip the comparison and the ordering
+        backwards = reverse
+        descending = self.descending != backwards
+        ordering = [('-' if descending else '') + name.lstrip('-') for name in self.ordering]
+        queryset = queryset.order_by(*ordering)
+
+        if position is not None:
+            value, pk = position
+            op = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{op}': value})
+                | Q(**{self.field: value, f'pk__{op}': pk})
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if backwards:
+            results.reverse()
+
+        self.page = results
+        self.has_next = has_more if not backwards else position is not None
+        self.has_previous = position is not None if not backwards else has_more
+        return results
+
+    # ---- cursor encoding ----
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii'))
+            value = self.model_field.to_python(data['v'])
+            pk = int(data['id'])
+            reverse = bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return (value, pk), reverse
+
+    def encode_cursor(self, instance, reverse):
+        value = self.model_field.value_to_string(instance)
+        data = {'v': value, 'id': instance.pk}
+        if reverse:
+            data['r'] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(data, separators=(',', ':')).encode('ascii')
+        ).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class PageOrCursorPagination(PageNumberPagination):
+    """
+    The usual ?page=N pagination, unless the client opts into keyset
+    pagination with ?pagination=cursor (follow-up pages carry ?cursor=).
+    Cursor mode always orders by the view's `cursor_ordering`.
+    """
+    mode_query_param = 'pagination'
+    cursor_class = KeysetPagination
+
+    def _use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self._use_cursor(request):
+            self.cursor_paginator = self.cursor_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
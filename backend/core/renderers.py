@@ -0,0 +1,43 @@
+# backend/core/renderers.py
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+# DRF's own fallback encoder: Decimal -> float, datetime -> ISO 8601 with
+# "Z", lazy translation strings -> str, querysets -> lists, ...
+_drf_default = JSONEncoder().default
+
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME  # format datetimes the DRF way
+    | orjson.OPT_NON_STR_KEYS
+)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer producing the same bytes as DRF's default settings
+    (compact, UTF-8, U+2028/U+2029 escaped) using orjson.
+
+    Anything orjson can't handle natively goes through DRF's encoder;
+    indented output, ensure_ascii and values orjson rejects (e.g. ints
+    over 64 bits) fall back to the stdlib renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_drf_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # same strict-javascript-subset escaping as JSONRenderer
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,65 @@
+# backend/core/serializers.py
+
+from rest_framework import serializers
+
+from .images import srcset, thumbnail_urls
+
+
+def parse_fields_param(request, param='fields'):
+    """
+    ?fields=id,title,slug -> ['id', 'title', 'slug'] (None when absent).
+    """
+    if request is None:
+        return None
+    raw = request.query_params.get(param)
+    if not raw:
+        return None
+    return [name.strip() for name in raw.split(',') if name.strip()]
+
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin taking an optional `fields` argument that limits
+    which of the declared fields are serialized (sparse fieldsets).
+    Unknown names are ignored.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SrcsetField(serializers.Field):
+    """
+    Read-only `srcset` string built from a `<field>_thumbnails` map,
+    e.g. "https://…-160w.webp 160w, https://…-320w.webp 320w".
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return srcset(value, self.context.get('request'))
+
+
+class ThumbnailField(SrcsetField):
+    """
+    URL of the widest thumbnail not wider than `width` (the narrowest one
+    when all are wider), for clients that don't use srcset.
+    """
+
+    def __init__(self, width=320, **kwargs):
+        self.width = width
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        urls = thumbnail_urls(value, self.context.get('request'))
+        if not urls:
+            return None
+        fitting = [url for w, url in urls if w <= self.width]
+        return fitting[-1] if fitting else urls[0][1]
@@ -0,0 +1,47 @@
+# backend/core/thumbnails.py
+"""
+Thumbnail rendering on plain bytes with Pillow.
+
+Deliberately free of Django imports: under the spawn / forkserver start
+methods a ProcessPoolExecutor worker imports this module from scratch,
+without settings or app loading (core.images passes the configuration in).
+"""
+
+import hashlib
+import io
+
+from PIL import Image, ImageOps
+
+
+def render(data, widths, fmt, quality):
+    """
+    Bytes of a source image -> (sha256 hex digest, {width: encoded bytes}).
+    Never upscales: widths beyond the source collapse into one copy at
+    the source width.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+        rendered = {}
+        for width in widths:
+            target = min(width, image.width)
+            if target in rendered:
+                break
+            height = max(1, round(image.height * target / image.width))
+            out = io.BytesIO()
+            image.resize((target, height), Image.Resampling.LANCZOS).save(
+                out, fmt, quality=quality
+            )
+            rendered[target] = out.getvalue()
+    return digest, rendered
+
+
+def render_or_none(data, widths, fmt, quality):
+    # worker entry point; bad images just get no thumbnails
+    try:
+        return render(data, widths, fmt, quality)
+    except Exception:
+        return None
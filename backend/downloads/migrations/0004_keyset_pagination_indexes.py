@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_keyset_pagination_indexes'),
+        ('downloads', '0003_alter_purchaseitem_is_active'),
+        ('orders', '0002_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='purchaseitem',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='purchase_user_created_id_idx'),
+        ),
+    ]
@@ -25,6 +25,9 @@ class PurchaseItem(TimeStampedModel):
 
     class Meta:
         unique_together = ('user', 'book')
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id'], name='purchase_user_created_id_idx'),
+        ]
 
     def can_download(self):
         if not self.is_active:
@@ -1,11 +1,13 @@
 # downloads/serializers.py
+from django.db.models import Prefetch
 from rest_framework import serializers
 from .models import PurchaseItem
-from catalog.serializers import BookListSerializer
+from catalog.models import Book
+from catalog.serializers import BookCardSerializer
 
 
 class PurchaseItemSerializer(serializers.ModelSerializer):
-    book = BookListSerializer(read_only=True)
+    book = BookCardSerializer(read_only=True)
     order_status = serializers.CharField(
         source='order_item.order.status',
         read_only=True
@@ -24,6 +26,12 @@ class PurchaseItemSerializer(serializers.ModelSerializer):
             'payment_status',
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('order_item__order__payment').prefetch_related(
+            Prefetch('book', queryset=Book.objects.for_card())
+        )
+
     def get_payment_status(self, obj):
         order = obj.order_item.order if obj.order_item else None
         payment = getattr(order, 'payment', None) if order else None
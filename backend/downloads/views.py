@@ -4,7 +4,7 @@ from pathlib import Path
 
 from django.conf import settings
 from django.urls import reverse
-from django.http import FileResponse, Http404
+from django.http import FileResponse, Http404, HttpResponseNotModified
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import generics, permissions, status
@@ -12,6 +12,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from core.throttles import DownloadThrottle
+from core.pagination import PageOrCursorPagination
 from .models import PurchaseItem, DownloadLink, DownloadLog
 from .serializers import PurchaseItemSerializer
 
@@ -21,17 +22,19 @@ class LibraryListView(generics.ListAPIView):
     GET /api/library/
     -> list of ebooks the current user owns (both active & pending)
     Frontend will show "Payment pending" if !is_active or payment_status != success.
+    ?pagination=cursor -> keyset pagination on (created_at, id)
     """
     serializer_class = PurchaseItemSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PageOrCursorPagination
 
     def get_queryset(self):
-        return (
+        queryset = (
             PurchaseItem.objects
             .filter(user=self.request.user)  # ❗ no is_active filter here
-            .select_related('book', 'order_item__order')
             .order_by('-purchased_at')
         )
+        return PurchaseItemSerializer.setup_eager_loading(queryset)
 
 
 class GenerateDownloadLinkView(APIView):
@@ -79,6 +82,8 @@ class DownloadEbookView(APIView):
     """
     GET /api/download/<token>/
     - does NOT require JWT (token itself is secret)
+    - files are content-addressed, so the stored SHA-256 is a strong ETag
+      and If-None-Match gets a 304 without counting as a download
     """
     permission_classes = []  # token-based
     throttle_classes = [DownloadThrottle]
@@ -106,6 +111,12 @@ class DownloadEbookView(APIView):
         if not book.file:
             raise Http404("File not found.")
 
+        etag = f'"{book.file_sha256}"' if book.file_sha256 else None
+        if etag and etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
         # 4) log download + increment counter
         DownloadLog.objects.create(
             purchase_item=purchase_item,
@@ -126,4 +137,9 @@ class DownloadEbookView(APIView):
             as_attachment=True,
             filename=filename,
         )
+        if etag:
+            response["ETag"] = etag
+        if book.file_size is not None:
+            # known size; no need to ask the storage backend
+            response["Content-Length"] = book.file_size
         return response
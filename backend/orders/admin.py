@@ -45,9 +45,9 @@
 # backend/orders/admin.py
 
 from django.contrib import admin
-from django.utils import timezone
 from .models import Cart, CartItem, Order, OrderItem
 from .emails import send_payment_confirmed_email  # <-- important
+from .sales import record_status_change
 
 
 class CartItemInline(admin.TabularInline):
@@ -92,13 +92,11 @@ class OrderAdmin(admin.ModelAdmin):
             old_status = Order.objects.get(pk=obj.pk).status
 
         super().save_model(request, obj, form, change)
+        # sales rollup; also stamps paid_at on the way into PAID
+        record_status_change(obj, old_status)
 
         # Only trigger email when status actually changes to PAID
         if old_status != obj.status and obj.status == Order.Status.PAID:
-            if obj.paid_at is None:
-                obj.paid_at = timezone.now()
-                obj.save(update_fields=["paid_at"])
-
             try:
                 send_payment_confirmed_email(obj)
             except Exception as e:
@@ -0,0 +1,191 @@
+# backend/orders/cart.py
+"""
+Carts: lookup (user or guest), read model and guest-cart merging.
+
+Guests get a cart keyed by Cart.session_id, an opaque token the API
+hands out as the cart's `session_id` when the first item is added; the
+client sends it back in the X-Cart-Session header. At login
+merge_guest_cart() moves the guest items into the user's cart with one
+upsert.
+
+cart_payload() builds the serialized cart (items, book cards, totals) in
+a fixed number of queries: the cart with its totals aggregated in the
+database, its items, their books and the books' authors. The payload is
+cached under the cart's own generation number plus the catalog's, so
+polling the cart badge is a cache hit until the cart or a book changes.
+
+Every code path that changes a cart's items must call invalidate_cart()
+(after commit when inside a transaction).
+"""
+
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from catalog.models import Book
+from core.cache import bump_cache_version, get_cache_version
+from .models import Cart, CartItem
+from .serializers import CartSerializer
+
+
+CART_CACHE_TIMEOUT = getattr(settings, 'CART_CACHE_TIMEOUT', settings.RESPONSE_CACHE_TIMEOUT)
+CART_SESSION_HEADER = 'X-Cart-Session'
+MAX_SESSION_ID_LENGTH = 255
+
+
+def cart_session_id(request):
+    return request.headers.get(CART_SESSION_HEADER, '').strip()[:MAX_SESSION_ID_LENGTH]
+
+
+def get_cart(request, create=False):
+    """
+    The user's cart, or for guests the cart named by the X-Cart-Session
+    header. With create=True a missing cart is created (guests get a new
+    session id); otherwise None is returned.
+    """
+    if request.user.is_authenticated:
+        if create:
+            return Cart.objects.get_or_create(user=request.user)[0]
+        return Cart.objects.filter(user=request.user).first()
+
+    session_id = cart_session_id(request)
+    cart = None
+    if session_id:
+        cart = Cart.objects.filter(user=None, session_id=session_id).first()
+    if cart is None and create:
+        cart = Cart.objects.create(session_id=secrets.token_urlsafe(32))
+    return cart
+
+
+def cart_namespace(cart_id):
+    return f'cart-{cart_id}'
+
+
+def invalidate_cart(cart_id):
+    bump_cache_version(cart_namespace(cart_id))
+
+
+def with_totals(queryset):
+    money = DecimalField(max_digits=12, decimal_places=2)
+    return queryset.annotate(
+        items_count=Count('items'),
+        total_quantity=Coalesce(Sum('items__quantity'), 0),
+        total_amount=Coalesce(
+            Sum(F('items__quantity') * F('items__unit_price'), output_field=money),
+            Value(0),
+            output_field=money,
+        ),
+    )
+
+
+def cart_payload(cart_id):
+    namespaces = (cart_namespace(cart_id), 'catalog')
+    versions = get_cache_version(*namespaces)
+    key = f'cart-payload:{cart_id}:' + ','.join(str(versions[ns]) for ns in namespaces)
+
+    data = cache.get(key)
+    if data is None:
+        cart = (
+            with_totals(Cart.objects.filter(pk=cart_id))
+            .prefetch_related(*CartSerializer.get_prefetches())
+            .get()
+        )
+        data = CartSerializer(cart).data
+        cache.set(key, data, CART_CACHE_TIMEOUT)
+    return data
+
+
+def empty_cart_payload():
+    """
+    What GET /api/cart/ returns before a guest has a cart.
+    """
+    return {
+        'id': None, 'user': None, 'session_id': '', 'items': [], 'items_count': 0,
+        'total_quantity': 0, 'total_amount': '0.00', 'created_at': None, 'updated_at': None,
+    }
+
+
+def merge_guest_cart(user, session_id='', items=()):
+    """
+    Move the guest cart `session_id` (and/or extra `items`, e.g. a cart
+    kept in localStorage: [{'book_id': 1, 'quantity': 1}, ...]) into the
+    user's cart and delete the guest cart. A book already in the user's
+    cart keeps the larger quantity. Unknown or unpublished books are
+    skipped. All rows are written with one INSERT ... ON CONFLICT.
+    Returns (user cart, number of merged items).
+    """
+    with transaction.atomic():
+        cart, _ = Cart.objects.get_or_create(user=user)
+        guest = None
+        if session_id:
+            guest = (
+                Cart.objects.select_for_update()
+                .filter(user=None, session_id=session_id)
+                .first()
+            )
+
+        wanted = {}
+        if guest is not None:
+            for book_id, quantity in guest.items.values_list('book_id', 'quantity'):
+                wanted[book_id] = max(quantity, wanted.get(book_id, 0))
+        for item in items:
+            wanted[item['book_id']] = max(item.get('quantity', 1), wanted.get(item['book_id'], 0))
+
+        prices = dict(
+            Book.objects.filter(pk__in=wanted, is_published=True)
+            .values_list('pk', 'effective_price')
+        )
+        merged = []
+        if prices:
+            existing = dict(cart.items.filter(book_id__in=prices).values_list('book_id', 'quantity'))
+            merged = CartItem.objects.bulk_create(
+                [
+                    CartItem(
+                        cart=cart,
+                        book_id=book_id,
+                        quantity=max(wanted[book_id], existing.get(book_id, 0)),
+                        unit_price=unit_price,
+                    )
+                    for book_id, unit_price in prices.items()
+                ],
+                update_conflicts=True,
+                unique_fields=['cart', 'book'],
+                update_fields=['quantity', 'unit_price', 'updated_at'],
+            )
+
+        if guest is not None:
+            guest_id = guest.pk
+            guest.delete()
+            transaction.on_commit(lambda: invalidate_cart(guest_id))
+        transaction.on_commit(lambda: invalidate_cart(cart.pk))
+    return cart, len(merged)
+
+
+def apply_cart_batch(cart, quantities, prices, replace=False):
+    """
+    Set several items of `cart` at once: `quantities` is {book_id: quantity}
+    (0 removes the book), `prices` the current effective_price of every
+    book being added. With replace=True books not listed are removed too.
+    One DELETE and one INSERT ... ON CONFLICT, in a transaction.
+    """
+    keep = {book_id: quantity for book_id, quantity in quantities.items() if quantity > 0}
+
+    with transaction.atomic():
+        removed = cart.items.exclude(book_id__in=keep) if replace else cart.items.filter(
+            book_id__in=[book_id for book_id, quantity in quantities.items() if quantity <= 0]
+        )
+        removed.delete()
+        CartItem.objects.bulk_create(
+            [
+                CartItem(cart=cart, book_id=book_id, quantity=quantity, unit_price=prices[book_id])
+                for book_id, quantity in keep.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['cart', 'book'],
+            update_fields=['quantity', 'unit_price', 'updated_at'],
+        )
+        transaction.on_commit(lambda: invalidate_cart(cart.pk))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from orders.models import Cart
+
+
+class Command(BaseCommand):
+    help = "Delete guest (session) carts that haven't been touched for a while."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Delete guest carts idle for more than this many days (default: 30)",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        cutoff = timezone.now() - timezone.timedelta(days=days)
+
+        stale = (
+            Cart.objects.filter(user__isnull=True, updated_at__lt=cutoff)
+            .exclude(items__updated_at__gte=cutoff)
+        )
+        num_carts = stale.count()
+        stale.delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {num_carts} guest carts idle for more than {days} days.")
+        )
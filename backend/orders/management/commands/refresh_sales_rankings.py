@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from orders.sales import rebuild_daily_sales, refresh_sales_rankings
+
+
+class Command(BaseCommand):
+    help = "Recompute bestseller (sales_7d/30d) and trending rankings; run daily."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recreate the daily sales rollup from all paid orders first",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            rows = rebuild_daily_sales()
+            self.stdout.write(f"Rebuilt {rows} daily sales rows.")
+
+        count = refresh_sales_rankings()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated sales rankings for {count} books.")
+        )
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0010_book_sales_rankings'),
+        ('orders', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyBookSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('units', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='catalog.book')),
+            ],
+            options={
+                'verbose_name_plural': 'daily book sales',
+                'indexes': [models.Index(fields=['date'], name='daily_book_sales_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('book', 'date'), name='daily_book_sales_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_dailybooksales'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cart',
+            name='session_id',
+            field=models.CharField(blank=True, db_index=True, max_length=255),
+        ),
+    ]
@@ -13,7 +13,8 @@ User = settings.AUTH_USER_MODEL
 
 class Cart(TimeStampedModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
-    session_id = models.CharField(max_length=255, blank=True)
+    # guest carts (user is NULL) are looked up by this token (orders.cart)
+    session_id = models.CharField(max_length=255, blank=True, db_index=True)
 
     def __str__(self):
         return f"Cart {self.id}"
@@ -53,6 +54,11 @@ class Order(TimeStampedModel):
 
     paid_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='order_created_id_idx'),
+        ]
+
     def __str__(self):
         return f"Order {self.order_number}"
 
@@ -67,3 +73,26 @@ class OrderItem(TimeStampedModel):
 
     def __str__(self):
         return f"{self.book.title} x {self.quantity}"
+
+
+class DailyBookSales(models.Model):
+    """
+    Units sold and revenue per book per day (by paid_at), the rollup
+    behind bestseller/trending rankings. Maintained by orders.sales.
+    """
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='daily_sales')
+    date = models.DateField()
+    units = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['book', 'date'], name='daily_book_sales_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='daily_book_sales_date_idx'),
+        ]
+        verbose_name_plural = 'daily book sales'
+
+    def __str__(self):
+        return f"{self.book} on {self.date}: {self.units}"
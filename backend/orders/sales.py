@@ -0,0 +1,144 @@
+# backend/orders/sales.py
+"""
+Bestseller / trending rankings.
+
+DailyBookSales holds units and revenue per (book, day). When an order
+becomes paid, record_order_sales() adds its items to today's rows and
+bumps Book.sales_7d / sales_30d / trending_score in place, so rankings
+move immediately. Sliding windows and decay can't be maintained
+incrementally, so refresh_sales_rankings() recomputes them from the
+(small) last-30-days slice of the rollup once a day.
+
+trending_score = sum(units * 0.5 ** (age_in_days / TRENDING_HALF_LIFE_DAYS))
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from catalog.models import Book
+from core.cache import bump_cache_version
+from .models import DailyBookSales, Order, OrderItem
+
+
+TRENDING_WINDOW_DAYS = 30
+TRENDING_HALF_LIFE_DAYS = 3
+
+
+def record_status_change(order, old_status):
+    """
+    Call after saving an order whose status may have changed from
+    `old_status`: entering PAID records its sales (and stamps paid_at if
+    missing), leaving PAID takes them back. Every path that changes an
+    order's status goes through here (Payment.mark_as_success/failed,
+    the admin order API and the Django admin), so each transition is
+    counted exactly once.
+    """
+    paid = Order.Status.PAID
+    if old_status != paid and order.status == paid:
+        if order.paid_at is None:
+            order.paid_at = timezone.now()
+            order.save(update_fields=['paid_at'])
+        record_order_sales(order)
+    elif old_status == paid and order.status != paid:
+        record_order_sales(order, sign=-1)
+
+
+def record_order_sales(order, sign=1):
+    """
+    Add (sign=1) or take back (sign=-1, e.g. a paid order later failed)
+    the order's items in the rollup and the book counters (a deleted paid
+    order is taken back by orders.signals).
+    """
+    day = timezone.localdate(order.paid_at or timezone.now())
+    rows = list(
+        order.items.values('book_id')
+        .annotate(units=Sum('quantity'), revenue=Sum('subtotal'))
+        .order_by('book_id')
+    )
+
+    with transaction.atomic():
+        for row in rows:
+            units, revenue = sign * row['units'], sign * row['revenue']
+            DailyBookSales.objects.get_or_create(book_id=row['book_id'], date=day)
+            DailyBookSales.objects.filter(book_id=row['book_id'], date=day).update(
+                units=F('units') + units,
+                revenue=F('revenue') + revenue,
+            )
+            if sign > 0:
+                # today's sales weigh 1.0; the daily refresh applies decay
+                Book.objects.filter(pk=row['book_id']).update(
+                    sales_7d=F('sales_7d') + units,
+                    sales_30d=F('sales_30d') + units,
+                    trending_score=F('trending_score') + units,
+                )
+        if sign < 0:
+            # decrements could go negative against decayed values
+            refresh_sales_rankings(book_ids=[row['book_id'] for row in rows])
+
+    bump_cache_version('catalog')
+
+
+def refresh_sales_rankings(today=None, book_ids=None):
+    """
+    Recompute sales_7d / sales_30d / trending_score from DailyBookSales
+    (for `book_ids`, or every book that has or had a non-zero ranking).
+    Returns the number of books updated.
+    """
+    today = today or timezone.localdate()
+    since = today - timedelta(days=TRENDING_WINDOW_DAYS - 1)
+
+    daily = DailyBookSales.objects.filter(date__gte=since, date__lte=today)
+    books = Book.objects.all()
+    if book_ids is not None:
+        daily = daily.filter(book_id__in=book_ids)
+        books = books.filter(pk__in=book_ids)
+    else:
+        books = books.filter(
+            Q(sales_30d__gt=0) | Q(trending_score__gt=0) | Q(pk__in=daily.values('book_id'))
+        )
+
+    totals = defaultdict(lambda: [0, 0, 0.0])
+    for book_id, date, units in daily.values_list('book_id', 'date', 'units').iterator():
+        age = (today - date).days
+        stats = totals[book_id]
+        if age < 7:
+            stats[0] += units
+        stats[1] += units
+        stats[2] += units * 0.5 ** (age / TRENDING_HALF_LIFE_DAYS)
+
+    changed = []
+    for book in books.only('pk', 'sales_7d', 'sales_30d', 'trending_score').iterator():
+        sales_7d, sales_30d, score = totals.get(book.pk, (0, 0, 0.0))
+        values = (max(sales_7d, 0), max(sales_30d, 0), round(max(score, 0.0), 6))
+        if values != (book.sales_7d, book.sales_30d, book.trending_score):
+            book.sales_7d, book.sales_30d, book.trending_score = values
+            changed.append(book)
+
+    Book.objects.bulk_update(changed, ['sales_7d', 'sales_30d', 'trending_score'], batch_size=1000)
+    if changed:
+        bump_cache_version('catalog')
+    return len(changed)
+
+
+def rebuild_daily_sales():
+    """
+    Recreate DailyBookSales from every paid order (one GROUP BY).
+    """
+    rows = (
+        OrderItem.objects.filter(order__status=Order.Status.PAID, order__paid_at__isnull=False)
+        .annotate(date=TruncDate('order__paid_at'))
+        .values('book_id', 'date')
+        .annotate(units=Sum('quantity'), revenue=Sum('subtotal'))
+        .order_by()
+    )
+    with transaction.atomic():
+        DailyBookSales.objects.all().delete()
+        DailyBookSales.objects.bulk_create(
+            (DailyBookSales(**row) for row in rows.iterator()), batch_size=5000
+        )
+    return DailyBookSales.objects.count()
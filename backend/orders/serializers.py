@@ -1,10 +1,11 @@
 # backend/orders/serializers.py
 
 from django.conf import settings
+from django.db.models import Prefetch
 from rest_framework import serializers
 
 from .models import Cart, CartItem, Order, OrderItem
-from catalog.serializers import BookListSerializer
+from catalog.serializers import BookCardSerializer
 from catalog.models import Book
 from accounts.serializers import AddressSerializer
 from accounts.models import Address
@@ -14,7 +15,7 @@ User = settings.AUTH_USER_MODEL
 
 
 class CartItemSerializer(serializers.ModelSerializer):
-    book = BookListSerializer(read_only=True)
+    book = BookCardSerializer(read_only=True)
     book_id = serializers.PrimaryKeyRelatedField(
         queryset=Book.objects.filter(is_published=True),
         source='book',
@@ -30,13 +31,30 @@ class CartItemSerializer(serializers.ModelSerializer):
 
 
 class CartSerializer(serializers.ModelSerializer):
+    """
+    Expects a cart loaded through orders.cart.with_totals().
+    """
     items = CartItemSerializer(many=True, read_only=True)
+    items_count = serializers.IntegerField(read_only=True)
+    total_quantity = serializers.IntegerField(read_only=True)
+    total_amount = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
 
     class Meta:
         model = Cart
-        fields = ['id', 'user', 'session_id', 'items', 'created_at', 'updated_at']
+        fields = [
+            'id', 'user', 'session_id', 'items', 'items_count', 'total_quantity',
+            'total_amount', 'created_at', 'updated_at',
+        ]
         read_only_fields = ['user', 'created_at', 'updated_at']
 
+    @staticmethod
+    def get_prefetches():
+        """
+        Lookups for prefetch_related()/prefetch_related_objects() so a cart
+        serializes in a constant number of queries.
+        """
+        return [Prefetch('items__book', queryset=Book.objects.for_card())]
+
 
 # For safety we also keep a simpler "add to cart" serializer
 class CartItemAddSerializer(serializers.Serializer):
@@ -47,8 +65,56 @@ class CartItemAddSerializer(serializers.Serializer):
     quantity = serializers.IntegerField(min_value=1, default=1)
 
 
+class CartBatchItemSerializer(serializers.Serializer):
+    book_id = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=0)
+
+
+class CartBatchSerializer(serializers.Serializer):
+    """
+    PUT /api/cart/items/batch/ body. Validates every book id with one
+    query; validated_data gets `quantities` ({book_id: quantity}) and
+    `prices` ({book_id: effective_price} of the books being added).
+    """
+    MAX_ITEMS = 100
+
+    items = CartBatchItemSerializer(many=True, allow_empty=True)
+    replace = serializers.BooleanField(default=False)
+
+    def validate_items(self, items):
+        if len(items) > self.MAX_ITEMS:
+            raise serializers.ValidationError(f'At most {self.MAX_ITEMS} items per request.')
+        return items
+
+    def validate(self, attrs):
+        # last operation for a book wins
+        quantities = {item['book_id']: item['quantity'] for item in attrs['items']}
+        adding = [book_id for book_id, quantity in quantities.items() if quantity > 0]
+        prices = dict(
+            Book.objects.filter(pk__in=adding, is_published=True)
+            .values_list('pk', 'effective_price')
+        )
+        unknown = sorted(set(adding) - set(prices))
+        if unknown:
+            raise serializers.ValidationError(
+                {'items': [f'Unknown or unavailable book ids: {unknown}.']}
+            )
+        attrs['quantities'] = quantities
+        attrs['prices'] = prices
+        return attrs
+
+
+class CartMergeItemSerializer(serializers.Serializer):
+    book_id = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+
+class CartMergeSerializer(serializers.Serializer):
+    items = CartMergeItemSerializer(many=True, required=False, default=list)
+
+
 class OrderItemSerializer(serializers.ModelSerializer):
-    book = BookListSerializer(read_only=True)
+    book = BookCardSerializer(read_only=True)
 
     class Meta:
         model = OrderItem
@@ -93,6 +159,16 @@ class OrderSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
 
+    @staticmethod
+    def get_prefetches():
+        return [Prefetch('items__book', queryset=Book.objects.for_card())]
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related('billing_address', 'payment').prefetch_related(
+            *cls.get_prefetches()
+        )
+
 
 class AdminOrderSerializer(OrderSerializer):
     user_details = serializers.SerializerMethodField()
@@ -107,6 +183,10 @@ class AdminOrderSerializer(OrderSerializer):
             'updated_at',
         ]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return super().setup_eager_loading(queryset).select_related('user')
+
     def get_user_details(self, obj):
         if obj.user:
             return {
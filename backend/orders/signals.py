@@ -0,0 +1,15 @@
+# backend/orders/signals.py
+
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from .models import Order
+from .sales import record_order_sales
+
+
+# deleting a paid order takes its sales back, like refunding it would;
+# pre_delete, while its items still exist
+@receiver(pre_delete, sender=Order)
+def order_deleting(sender, instance, **kwargs):
+    if instance.status == Order.Status.PAID:
+        record_order_sales(instance, sign=-1)
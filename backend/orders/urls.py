@@ -3,7 +3,9 @@ from django.urls import path
 from .views import (
     CartView,
     CartItemAddView,
+    CartItemBatchView,
     CartItemUpdateView,
+    CartMergeView,
     CheckoutView,
     OrderListView,
     OrderDetailView,
@@ -14,7 +16,9 @@ from .views import (
 urlpatterns = [
     path('cart/', CartView.as_view(), name='cart-detail'),
     path('cart/items/', CartItemAddView.as_view(), name='cartitem-add'),
+    path('cart/items/batch/', CartItemBatchView.as_view(), name='cartitem-batch'),
     path('cart/items/<int:pk>/', CartItemUpdateView.as_view(), name='cartitem-update'),
+    path('cart/merge/', CartMergeView.as_view(), name='cart-merge'),
 
     path('checkout/', CheckoutView.as_view(), name='checkout'),
 
@@ -3,18 +3,39 @@ from downloads.models import PurchaseItem
 import uuid
 from decimal import Decimal
 
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, prefetch_related_objects
 from django.utils import timezone
 from rest_framework import status, permissions, generics
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .cart import (
+    apply_cart_batch,
+    cart_payload,
+    cart_session_id,
+    empty_cart_payload,
+    get_cart,
+    invalidate_cart,
+    merge_guest_cart,
+)
 from .models import Cart, CartItem, Order, OrderItem
-from .serializers import CartSerializer, CartItemAddSerializer, OrderSerializer, AdminOrderSerializer
+from .serializers import (
+    CartBatchSerializer,
+    CartItemAddSerializer,
+    CartMergeSerializer,
+    OrderSerializer,
+    AdminOrderSerializer,
+)
+from .sales import record_status_change
 from accounts.models import Address
+from catalog.models import Book
 from payments.models import Payment
 from coupons.models import Coupon, CouponRedemption
 from coupons.utils import calculate_coupon_discount
 from .emails import send_payment_confirmed_email, send_order_notification_admin
+from core.idempotency import idempotent
+from core.pagination import PageOrCursorPagination
 
 def generate_order_number() -> str:
     """
@@ -29,34 +50,43 @@ def get_or_create_user_cart(user):
     return cart
 
 
+def serialize_cart(cart):
+    return cart_payload(cart.pk)
+
+
 class CartView(APIView):
     """
-    GET /api/cart/   -> current user's cart
+    GET /api/cart/   -> current user's cart (created on first access)
+    Guests: the cart named by the X-Cart-Session header (orders.cart);
+    no cart is created for them until they add an item.
     """
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.AllowAny]
 
     def get(self, request, *args, **kwargs):
-        cart = get_or_create_user_cart(request.user)
-        serializer = CartSerializer(cart)
-        return Response(serializer.data)
+        cart = get_cart(request, create=request.user.is_authenticated)
+        if cart is None:
+            return Response(empty_cart_payload())
+        return Response(serialize_cart(cart))
 
 
 class CartItemAddView(APIView):
     """
     POST /api/cart/items/
     Body: { "book_id": 1, "quantity": 1 }
+    A guest without X-Cart-Session gets a new cart; its `session_id` is
+    the header value to send from then on.
     """
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.AllowAny]
 
     def post(self, request, *args, **kwargs):
-        cart = get_or_create_user_cart(request.user)
         serializer = CartItemAddSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         book = serializer.validated_data["book"]
         quantity = serializer.validated_data["quantity"]
+        cart = get_cart(request, create=True)
 
-        # unit price from book.effective_price
+        # unit price from the book's stored effective_price column
         unit_price = Decimal(book.effective_price)
 
         # if already in cart, increase quantity
@@ -69,9 +99,28 @@ class CartItemAddView(APIView):
             item.quantity += quantity
             item.unit_price = unit_price
             item.save()
+        invalidate_cart(cart.pk)
+
+        return Response(serialize_cart(cart), status=status.HTTP_201_CREATED)
+
+
+class CartItemBatchView(APIView):
+    """
+    PUT /api/cart/items/batch/
+    Body: { "items": [{ "book_id": 1, "quantity": 1 }, ...], "replace": false }
+    -> sets each book's quantity (0 removes it); with "replace": true the
+       cart ends up exactly as listed. All-or-nothing, returns the cart.
+    """
+    permission_classes = [permissions.AllowAny]
 
-        cart_serializer = CartSerializer(cart)
-        return Response(cart_serializer.data, status=status.HTTP_201_CREATED)
+    def put(self, request, *args, **kwargs):
+        serializer = CartBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        cart = get_cart(request, create=True)
+        apply_cart_batch(cart, data["quantities"], data["prices"], replace=data["replace"])
+        return Response(serialize_cart(cart))
 
 
 class CartItemUpdateView(APIView):
@@ -82,14 +131,17 @@ class CartItemUpdateView(APIView):
     DELETE /api/cart/items/<id>/
     -> remove item
     """
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.AllowAny]
+
+    def get_item(self, request, pk):
+        cart = get_cart(request)
+        if cart is None:
+            raise CartItem.DoesNotExist
+        return CartItem.objects.select_related("cart").get(pk=pk, cart=cart)
 
     def patch(self, request, pk, *args, **kwargs):
         try:
-            item = CartItem.objects.select_related("cart").get(
-                pk=pk,
-                cart__user=request.user,
-            )
+            item = self.get_item(request, pk)
         except CartItem.DoesNotExist:
             return Response(
                 {"detail": "Item not found."},
@@ -110,17 +162,13 @@ class CartItemUpdateView(APIView):
         else:
             item.quantity = quantity
             item.save()
+        invalidate_cart(item.cart_id)
 
-        cart = get_or_create_user_cart(request.user)
-        serializer = CartSerializer(cart)
-        return Response(serializer.data)
+        return Response(serialize_cart(item.cart))
 
     def delete(self, request, pk, *args, **kwargs):
         try:
-            item = CartItem.objects.select_related("cart").get(
-                pk=pk,
-                cart__user=request.user,
-            )
+            item = self.get_item(request, pk)
         except CartItem.DoesNotExist:
             return Response(
                 {"detail": "Item not found."},
@@ -129,25 +177,51 @@ class CartItemUpdateView(APIView):
 
         cart = item.cart
         item.delete()
+        invalidate_cart(cart.pk)
 
-        serializer = CartSerializer(cart)
-        return Response(serializer.data)
+        return Response(serialize_cart(cart))
 
 
-class CheckoutView(APIView):
+class CartMergeView(APIView):
+    """
+    POST /api/cart/merge/
+    Header: X-Cart-Session: <guest cart session_id>   (optional)
+    Body:   { "items": [{ "book_id": 1, "quantity": 1 }, ...] }   (optional)
+    -> moves the guest cart and/or the listed items into the user's cart
+       in one upsert, returns the merged cart.
+    Login does the same automatically when X-Cart-Session is sent.
+    """
+    permission_classes = [permissions.IsAuthenticated]
 
+    def post(self, request, *args, **kwargs):
+        serializer = CartMergeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        cart, merged = merge_guest_cart(
+            request.user,
+            session_id=cart_session_id(request),
+            items=serializer.validated_data["items"],
+        )
+        data = serialize_cart(cart)
+        data["merged"] = merged
+        return Response(data)
+
+
+class CheckoutView(APIView):
+    """
+    POST /api/checkout/
+    Turns the cart into a pending order in one transaction, with a fixed
+    number of queries however many books are in the cart: order items
+    and purchase items are written with bulk_create/bulk_update and the
+    cart is emptied with a single DELETE.
+    Send an Idempotency-Key header to make retries safe (core.idempotency).
+    """
     permission_classes = [permissions.IsAuthenticated]
 
+    @idempotent
     def post(self, request, *args, **kwargs):
         user = request.user
         cart = get_or_create_user_cart(user)
-        cart_items = cart.items.select_related('book')
-
-        if not cart_items.exists():
-            return Response(
-                {'detail': 'Cart is empty.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
 
         # 1) billing address
         billing_address = None
@@ -164,117 +238,117 @@ class CheckoutView(APIView):
         transaction_id = request.data.get('transaction_id', '').strip()
         customer_note = request.data.get('customer_note', '').strip()
 
-        # 3) calculate total BEFORE coupon
-        total = Decimal('0.00')
-        for item in cart_items:
-            total += item.subtotal
-
-        # 4) coupon
-        coupon_code = request.data.get('coupon_code')
-        coupon = None
-        discount_amount = Decimal('0.00')
-
-        if coupon_code:
-            try:
-                coupon = Coupon.objects.get(code__iexact=coupon_code.strip())
-            except Coupon.DoesNotExist:
+        with transaction.atomic():
+            # lock the cart so a double-submitted checkout can't order it twice
+            Cart.objects.select_for_update().filter(pk=cart.pk).first()
+            cart_items = cart.items.all()
+
+            # re-price every item from the current effective_price in one
+            # UPDATE, so discounts changed since it was added are honoured
+            cart_items.update(unit_price=Subquery(
+                Book.objects.filter(pk=OuterRef('book_id')).values('effective_price')[:1]
+            ))
+            # the cached cart shows unit prices, so it's stale from here on,
+            # also when checkout stops early (bumped once this commits)
+            invalidate_cart(cart.pk)
+            items = list(cart_items)
+
+            if not items:
                 return Response(
-                    {'detail': 'Invalid coupon code.'},
-                    status=status.HTTP_400_BAD_REQUEST,
+                    {'detail': 'Cart is empty.'},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
 
-            if not coupon.is_valid_now():
-                return Response(
-                    {'detail': 'Coupon is not currently valid.'},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+            # 3) calculate total BEFORE coupon
+            total = sum((item.subtotal for item in items), Decimal('0.00'))
+
+            # 4) coupon
+            coupon_code = request.data.get('coupon_code')
+            coupon = None
+            discount_amount = Decimal('0.00')
+
+            if coupon_code:
+                try:
+                    coupon = Coupon.objects.get(code__iexact=coupon_code.strip())
+                except Coupon.DoesNotExist:
+                    return Response(
+                        {'detail': 'Invalid coupon code.'},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+
+                if not coupon.is_valid_now():
+                    return Response(
+                        {'detail': 'Coupon is not currently valid.'},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+
+                # optional: one use per user
+                if CouponRedemption.objects.filter(
+                    coupon=coupon,
+                    user=user
+                ).exists():
+                    return Response(
+                        {'detail': 'You have already used this coupon.'},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+
+                discount_amount = calculate_coupon_discount(coupon, total)
+                total = max(Decimal('0.00'), total - discount_amount)
+
+            # 5) create order (payment still pending)
+            order = Order.objects.create(
+                user=user,
+                order_number=generate_order_number(),
+                status=Order.Status.PENDING,  # waiting for payment confirmation
+                total_amount=total,
+                currency='BDT',
+                payment_method=payment_method,
+                billing_address=billing_address,
+            )
 
-            # optional: one use per user
-            if CouponRedemption.objects.filter(
-                coupon=coupon,
-                user=user
-            ).exists():
-                return Response(
-                    {'detail': 'You have already used this coupon.'},
-                    status=status.HTTP_400_BAD_REQUEST,
+            # 6) create order items + "pending" purchase items (not active yet)
+            order_items = OrderItem.objects.bulk_create([
+                OrderItem(
+                    order=order,
+                    book_id=item.book_id,
+                    quantity=item.quantity,
+                    unit_price=item.unit_price,
+                    subtotal=item.subtotal,
                 )
+                for item in items
+            ])
+            attach_purchase_items(user, order_items)
 
-            discount_amount = calculate_coupon_discount(coupon, total)
-            total = max(Decimal('0.00'), total - discount_amount)
-
+            # 7) clear cart
+            cart_items.delete()
 
-        # 5) create order (payment still pending)
-        order = Order.objects.create(
-            user=user,
-            order_number=generate_order_number(),
-            status=Order.Status.PENDING,  # waiting for payment confirmation
-            total_amount=total,
-            currency='BDT',
-            payment_method=payment_method,
-            billing_address=billing_address,
-        )
-
-        # 6) create order items + "pending" purchase items (not active yet)
-        for item in cart_items:
-            order_item = OrderItem.objects.create(
+            # 8) create payment record with status=INITIATED
+            payment = Payment.objects.create(
                 order=order,
-                book=item.book,
-                quantity=item.quantity,
-                unit_price=item.unit_price,
-                subtotal=item.subtotal,
-            )
-
-            # Because of unique_together (user, book), we must NOT always create.
-            purchase, created = PurchaseItem.objects.get_or_create(
-                user=user,
-                book=item.book,
-                defaults={
-                    "order_item": order_item,
-                    "download_limit": None,
-                    "downloads_count": 0,
-                    "is_active": False,
-                },
+                gateway=payment_method,   # e.g. manual_bkash / manual_nagad
+                amount=total,
+                currency='BDT',
+                status=Payment.Status.INITIATED,
+                payer_number=payer_number or None,
+                gateway_transaction_id=transaction_id or None,
+                customer_note=customer_note or "",
             )
 
-            if not created:
-                # user already has this book → attach to latest order
-                purchase.order_item = order_item
-                purchase.is_active = False  # locked until payment success
-                purchase.save(update_fields=["order_item", "is_active"])
-
-        # 7) clear cart
-        cart_items.delete()
+            # 9) record coupon redemption (if any)
+            if coupon and discount_amount > 0:
+                CouponRedemption.objects.create(
+                    coupon=coupon,
+                    user=user,
+                    order=order,
+                )
+                Coupon.objects.filter(pk=coupon.pk).update(
+                    uses_count=F('uses_count') + 1
+                )
 
-        # --- NEW: notify admin/no-reply that an order was placed ---
-        try:
-            send_order_notification_admin(order)
-        except Exception as e:
-            # don't fail the checkout if email sending fails; just log
-            print("Failed to send admin order notification:", e)
-        # ---------------------------------------------------------
-
-        # 8) create payment record with status=INITIATED
-        payment = Payment.objects.create(
-            order=order,
-            gateway=payment_method,   # e.g. manual_bkash / manual_nagad
-            amount=total,
-            currency='BDT',
-            status=Payment.Status.INITIATED,
-            payer_number=payer_number or None,
-            gateway_transaction_id=transaction_id or None,
-            customer_note=customer_note or "",
-        )
-
-        # 9) record coupon redemption (if any)
-        if coupon and discount_amount > 0:
-            CouponRedemption.objects.create(
-                coupon=coupon,
-                user=user,
-                order=order,
-            )
-            coupon.uses_count = (coupon.uses_count or 0) + 1
-            coupon.save(update_fields=['uses_count'])
+            # notify admin/no-reply once the order is really there
+            transaction.on_commit(lambda: notify_order_placed(order))
 
+        prefetch_related_objects([order], *OrderSerializer.get_prefetches())
         serializer = OrderSerializer(order)
         data = serializer.data
         # attach payment status for frontend convenience
@@ -287,7 +361,52 @@ class CheckoutView(APIView):
         }
         return Response(data, status=status.HTTP_201_CREATED)
 
-      
+
+def attach_purchase_items(user, order_items):
+    """
+    Point the user's PurchaseItem for every ordered book at its new order
+    item, locked (is_active=False) until payment succeeds. Because of
+    unique_together (user, book) books the user already has a row for
+    are updated, the rest created: one SELECT plus one bulk write each.
+    """
+    existing = {
+        purchase.book_id: purchase
+        for purchase in PurchaseItem.objects.filter(
+            user=user,
+            book_id__in=[order_item.book_id for order_item in order_items],
+        ).only('pk', 'book_id')
+    }
+
+    now = timezone.now()
+    created, updated = [], []
+    for order_item in order_items:
+        purchase = existing.get(order_item.book_id)
+        if purchase is None:
+            created.append(PurchaseItem(
+                user=user,
+                book_id=order_item.book_id,
+                order_item=order_item,
+                download_limit=None,
+                downloads_count=0,
+                is_active=False,
+            ))
+        else:
+            # user already has this book → attach to latest order
+            purchase.order_item = order_item
+            purchase.is_active = False  # locked until payment success
+            purchase.updated_at = now
+            updated.append(purchase)
+
+    PurchaseItem.objects.bulk_create(created)
+    PurchaseItem.objects.bulk_update(updated, ['order_item', 'is_active', 'updated_at'])
+
+
+def notify_order_placed(order):
+    try:
+        send_order_notification_admin(order)
+    except Exception as e:
+        # don't fail the checkout if email sending fails; just log
+        print("Failed to send admin order notification:", e)
 
 
 class OrderListView(generics.ListAPIView):
@@ -299,10 +418,11 @@ class OrderListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return (
+        queryset = (
             Order.objects.filter(user=self.request.user)
             .order_by("-created_at")
         )
+        return OrderSerializer.setup_eager_loading(queryset)
 
 
 class OrderDetailView(generics.RetrieveAPIView):
@@ -313,19 +433,25 @@ class OrderDetailView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        return OrderSerializer.setup_eager_loading(
+            Order.objects.filter(user=self.request.user)
+        )
 
 
 class AdminOrderListView(generics.ListAPIView):
     """
     GET /api/orders/admin/
     -> list ALL orders (admin only)
+    ?pagination=cursor -> keyset pagination on (created_at, id)
     """
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = PageOrCursorPagination
 
     def get_queryset(self):
-        return Order.objects.all().order_by("-created_at")
+        return OrderSerializer.setup_eager_loading(
+            Order.objects.all().order_by("-created_at")
+        )
 
 
 class AdminOrderDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -336,10 +462,15 @@ class AdminOrderDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     serializer_class = AdminOrderSerializer
     permission_classes = [permissions.IsAdminUser]
-    queryset = Order.objects.all()
+
+    def get_queryset(self):
+        return AdminOrderSerializer.setup_eager_loading(Order.objects.all())
 
     def perform_update(self, serializer):
+        old_status = serializer.instance.status
         order = serializer.save()
+        # before mark_as_success(), which only sees the already-saved status
+        record_status_change(order, old_status)
 
         if order.status == Order.Status.PAID:
             from payments.models import Payment
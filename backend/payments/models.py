@@ -73,6 +73,7 @@ class Payment(TimeStampedModel):
     def mark_as_success(self, admin_user=None):
         from downloads.models import PurchaseItem
         from orders.emails import send_payment_confirmed_email
+        from orders.sales import record_status_change
 
         # 🔴 removed the "if self.status == SUCCESS: return" guard
 
@@ -85,9 +86,12 @@ class Payment(TimeStampedModel):
         # 2) update order
         order = self.order
         if order.status != order.Status.PAID:
+            old_status = order.status
             order.status = order.Status.PAID
             order.paid_at = timezone.now()
             order.save(update_fields=["status", "paid_at"])
+            # only on the transition, so repeated approvals don't double count
+            record_status_change(order, old_status)
 
         # 3) activate purchases
         PurchaseItem.objects.filter(
@@ -100,6 +104,7 @@ class Payment(TimeStampedModel):
     # ✅ helper – called when admin rejects
     def mark_as_failed(self, admin_user=None):
         from downloads.models import PurchaseItem
+        from orders.sales import record_status_change
 
         # 🔴 also safe to remove the early-return here
         # if self.status == self.Status.FAILED:
@@ -111,8 +116,10 @@ class Payment(TimeStampedModel):
         self.save(update_fields=["status", "verified_by", "verified_at"])
 
         order = self.order
+        old_status = order.status
         order.status = order.Status.FAILED
         order.save(update_fields=["status"])
+        record_status_change(order, old_status)
 
         PurchaseItem.objects.filter(
             order_item__order=order
@@ -6,6 +6,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 
+from core.idempotency import idempotent
 from orders.models import Order
 from .models import Payment
 from .serializers import ManualPaymentSubmitSerializer, PaymentSerializer
@@ -24,9 +25,11 @@ class ManualPaymentSubmitView(APIView):
 
     - Only the owner of the order can submit.
     - Sets payment.status = PENDING (waiting for admin review).
+    - Idempotency-Key header: a retry gets the first response back.
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @idempotent
     def post(self, request, order_id, *args, **kwargs):
         order = get_object_or_404(Order, id=order_id, user=request.user)
 
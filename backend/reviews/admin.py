@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Review
+from .models import Review, BookRatingStats
+from . import stats
 
 
 @admin.register(Review)
@@ -18,12 +19,50 @@ class ReviewAdmin(admin.ModelAdmin):
     actions = ["approve_reviews", "unapprove_reviews"]
 
     def approve_reviews(self, request, queryset):
-        queryset.update(is_approved=True)
+        stats.reviews_approval_changed(queryset, approved=True)
         self.message_user(request, "Selected reviews approved.")
 
     def unapprove_reviews(self, request, queryset):
-        queryset.update(is_approved=False)
+        stats.reviews_approval_changed(queryset, approved=False)
         self.message_user(request, "Selected reviews unapproved.")
 
     approve_reviews.short_description = "Mark selected reviews as approved"
     unapprove_reviews.short_description = "Mark selected reviews as unapproved"
+
+    # keep BookRatingStats in sync with edits made through the admin
+    def save_model(self, request, obj, form, change):
+        old = None
+        if change:
+            old = stats.snapshot(Review.objects.get(pk=obj.pk))
+
+        super().save_model(request, obj, form, change)
+
+        if old is None:
+            stats.review_added(obj)
+        else:
+            stats.review_changed(old, obj)
+
+    def delete_model(self, request, obj):
+        stats.review_removed(obj)
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        stats.reviews_approval_changed(queryset, approved=False)
+        super().delete_queryset(request, queryset)
+
+
+@admin.register(BookRatingStats)
+class BookRatingStatsAdmin(admin.ModelAdmin):
+    list_display = ("book", "average", "rating_count")
+    search_fields = ("book__title",)
+    readonly_fields = (
+        "book",
+        "rating_sum",
+        "rating_count",
+        "average",
+        "stars_1",
+        "stars_2",
+        "stars_3",
+        "stars_4",
+        "stars_5",
+    )
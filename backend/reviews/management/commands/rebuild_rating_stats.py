@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from reviews.stats import rebuild_rating_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-book rating aggregates from approved reviews."
+
+    def handle(self, *args, **options):
+        count = rebuild_rating_stats()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt rating stats for {count} books.")
+        )
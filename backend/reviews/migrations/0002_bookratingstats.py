@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_rating_stats(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    BookRatingStats = apps.get_model('reviews', 'BookRatingStats')
+
+    rows = {}
+    approved = (
+        Review.objects.filter(is_approved=True)
+        .order_by()
+        .values('book_id', 'rating')
+        .annotate(n=Count('pk'))
+    )
+    for row in approved:
+        stats = rows.setdefault(row['book_id'], BookRatingStats(book_id=row['book_id']))
+        stats.rating_sum += row['rating'] * row['n']
+        stats.rating_count += row['n']
+        if 1 <= row['rating'] <= 5:
+            field = f"stars_{row['rating']}"
+            setattr(stats, field, getattr(stats, field) + row['n'])
+
+    for stats in rows.values():
+        stats.average = stats.rating_sum / stats.rating_count
+    BookRatingStats.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_book_pdf_password'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookRatingStats',
+            fields=[
+                ('book', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_stats', serialize=False, to='catalog.book')),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('average', models.FloatField(db_index=True, default=0)),
+                ('stars_1', models.PositiveIntegerField(default=0)),
+                ('stars_2', models.PositiveIntegerField(default=0)),
+                ('stars_3', models.PositiveIntegerField(default=0)),
+                ('stars_4', models.PositiveIntegerField(default=0)),
+                ('stars_5', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'book rating stats',
+            },
+        ),
+        migrations.RunPython(populate_rating_stats, migrations.RunPython.noop),
+    ]
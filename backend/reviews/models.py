@@ -22,3 +22,33 @@ class Review(TimeStampedModel):
 
     def __str__(self):
         return f"{self.rating}★ by {self.user}"
+
+
+class BookRatingStats(models.Model):
+    """
+    Denormalized rating aggregate for approved reviews, one row per book.
+    Maintained incrementally by reviews.stats; rebuild with
+    `manage.py rebuild_rating_stats`.
+    """
+    book = models.OneToOneField(
+        Book,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rating_stats',
+    )
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    average = models.FloatField(default=0, db_index=True)
+
+    # 1–5 star histogram
+    stars_1 = models.PositiveIntegerField(default=0)
+    stars_2 = models.PositiveIntegerField(default=0)
+    stars_3 = models.PositiveIntegerField(default=0)
+    stars_4 = models.PositiveIntegerField(default=0)
+    stars_5 = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'book rating stats'
+
+    def __str__(self):
+        return f"{self.book} ({self.average:.2f} from {self.rating_count})"
@@ -0,0 +1,14 @@
+# backend/reviews/signals.py
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.cache import bump_cache_version
+from .models import Review
+
+
+# ratings are part of every catalog payload
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, **kwargs):
+    bump_cache_version('catalog')
@@ -0,0 +1,122 @@
+# backend/reviews/stats.py
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, When
+from django.db.models.functions import Cast
+
+from core.cache import bump_cache_version
+from .models import Review, BookRatingStats
+
+
+def adjust_rating_stats(book_id, rating, delta):
+    """
+    Add `delta` approved reviews with `rating` to the book's stats row
+    (negative delta removes them). Uses F-expressions so concurrent
+    writers don't lose updates.
+    """
+    if not delta:
+        return
+
+    changes = {
+        'rating_sum': F('rating_sum') + rating * delta,
+        'rating_count': F('rating_count') + delta,
+    }
+    if 1 <= rating <= 5:
+        field = f'stars_{rating}'
+        changes[field] = F(field) + delta
+
+    with transaction.atomic():
+        BookRatingStats.objects.get_or_create(book_id=book_id)
+        stats = BookRatingStats.objects.filter(book_id=book_id)
+        stats.update(**changes)
+        stats.update(
+            average=Case(
+                When(rating_count__gt=0, then=Cast('rating_sum', FloatField()) / F('rating_count')),
+                default=0.0,
+                output_field=FloatField(),
+            )
+        )
+
+
+def review_added(review):
+    if review.is_approved:
+        adjust_rating_stats(review.book_id, review.rating, 1)
+
+
+def review_removed(review):
+    if review.is_approved:
+        adjust_rating_stats(review.book_id, review.rating, -1)
+
+
+def review_changed(old, review):
+    """
+    `old` is a (book_id, rating, is_approved) snapshot taken before saving.
+    """
+    old_book_id, old_rating, old_approved = old
+    if (old_book_id, old_rating, old_approved) == (review.book_id, review.rating, review.is_approved):
+        return
+    with transaction.atomic():
+        if old_approved:
+            adjust_rating_stats(old_book_id, old_rating, -1)
+        review_added(review)
+
+
+def snapshot(review):
+    return (review.book_id, review.rating, review.is_approved)
+
+
+def reviews_approval_changed(queryset, approved):
+    """
+    Flip is_approved on a queryset of reviews and move the affected
+    ratings in or out of the stats in one transaction.
+    """
+    with transaction.atomic():
+        changing = queryset.exclude(is_approved=approved)
+        groups = list(
+            changing.order_by()
+            .values('book_id', 'rating')
+            .annotate(n=Count('pk'))
+        )
+        changing.update(is_approved=approved)
+        sign = 1 if approved else -1
+        for row in groups:
+            adjust_rating_stats(row['book_id'], row['rating'], sign * row['n'])
+
+    # queryset.update() sends no post_save
+    bump_cache_version('catalog')
+
+
+def rebuild_rating_stats():
+    """
+    Recompute every BookRatingStats row from approved reviews.
+    Returns the number of rows written.
+    """
+    rows = {}
+    approved = (
+        Review.objects.filter(is_approved=True)
+        .order_by()
+        .values('book_id', 'rating')
+        .annotate(n=Count('pk'))
+    )
+    for row in approved:
+        stats = rows.setdefault(row['book_id'], Counter())
+        stats['rating_sum'] += row['rating'] * row['n']
+        stats['rating_count'] += row['n']
+        if 1 <= row['rating'] <= 5:
+            stats[f"stars_{row['rating']}"] += row['n']
+
+    objs = [
+        BookRatingStats(
+            book_id=book_id,
+            average=stats['rating_sum'] / stats['rating_count'],
+            **stats,
+        )
+        for book_id, stats in rows.items()
+    ]
+    with transaction.atomic():
+        BookRatingStats.objects.all().delete()
+        BookRatingStats.objects.bulk_create(objs, batch_size=1000)
+    bump_cache_version('catalog')
+    return len(objs)
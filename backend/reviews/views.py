@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
@@ -6,6 +7,7 @@ from rest_framework.exceptions import ValidationError
 from .models import Review
 from .serializers import ReviewSerializer
 from .permissions import IsReviewOwnerOrReadOnly
+from . import stats
 from downloads.models import PurchaseItem
 from catalog.models import Book
 
@@ -52,4 +54,18 @@ class ReviewViewSet(viewsets.ModelViewSet):
         if Review.objects.filter(user=user, book=book).exists():
             raise ValidationError("You have already reviewed this book.")
 
-        serializer.save(user=user)
+        with transaction.atomic():
+            review = serializer.save(user=user)
+            stats.review_added(review)
+
+    def perform_update(self, serializer):
+        old = stats.snapshot(serializer.instance)
+        with transaction.atomic():
+            review = serializer.save()
+            stats.review_changed(old, review)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            stats.review_removed(instance)
+            instance.delete()
+